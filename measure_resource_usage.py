@@ -1,6 +1,7 @@
 import random
 import resource
 from turnout_election_schemes.schemes.majorityjudgement import VoteAggregator, MajorityJudgementCount
+from turnout_election_schemes.schemes.majorityjudgement.algorithm import MajorityJudgement
 from turnout_election_schemes.schemes.singletransferablevote import SingleTransferableVoteScheme
 import sys
 
@@ -19,6 +20,10 @@ class MajorityJudgementDataGenerator(object):
     def grade(self):
         return random.randint(0, self.num_grades - 1)
 
+    def tally(self):
+        cuts = sorted(random.randint(0, self.num_voters) for _ in range(self.num_grades - 1))
+        return tuple(b - a for a, b in zip([0] + cuts, cuts + [self.num_voters]))
+
     def candidates(self):
         return range(self.num_candidates)
 
@@ -38,7 +43,13 @@ class SingleTransferableVoteDataGenerator(object):
 
 def usage():
     print 'Usage: %s mj num_grades num_candidates num_voters' % sys.argv[0]
-    print '       %s stv num_vacancies num_candidates num_voters' % sys.argv[0]
+    print '       %s mjmem num_grades num_candidates num_voters' % sys.argv[0]
+    print '       %s stv [num_vacancies num_candidates num_voters]' % sys.argv[0]
+    print
+    print 'The stv scenario defaults to %d vacancies, %d candidates and %d voters.' % STV_DEFAULTS
+    print 'The votes are generated from a fixed seed, so runs can be compared.'
+
+STV_DEFAULTS = (3, 100, 100000)
 
 def resource_usage():
     return resource.getrusage(resource.RUSAGE_SELF)
@@ -63,6 +74,16 @@ def test_majority_judgement(num_grades, num_candidates, num_voters):
 
     print_resource_usage(initial_resource_usage, resource_usage())
 
+def test_majority_judgement_memory(num_grades, num_candidates, num_voters):
+    generator = MajorityJudgementDataGenerator(num_grades, num_candidates, num_voters)
+    tallies = [generator.tally() for candidate in generator.candidates()]
+
+    initial_resource_usage = resource_usage()
+
+    candidates = [MajorityJudgement(tally) for tally in tallies]
+
+    print_resource_usage(initial_resource_usage, resource_usage())
+
 def test_single_transferable_vote(num_vacancies, num_candidates, num_voters):
     generator = SingleTransferableVoteDataGenerator(num_candidates, num_voters)
     candidates = generator.candidates()
@@ -83,6 +104,9 @@ def test_single_transferable_vote(num_vacancies, num_candidates, num_voters):
     print_resource_usage(initial_resource_usage, resource_usage())
 
 if __name__ == '__main__':
+    if len(sys.argv) == 2 and sys.argv[1] == 'stv':
+        sys.argv.extend(map(str, STV_DEFAULTS))
+
     if len(sys.argv) != 5:
         usage()
         sys.exit(1)
@@ -94,7 +118,11 @@ if __name__ == '__main__':
         usage()
         sys.exit(1)
 
+    random.seed(1)
+
     if system == 'mj':
         test_majority_judgement(*args)
+    elif system == 'mjmem':
+        test_majority_judgement_memory(*args)
     elif system == 'stv':
         test_single_transferable_vote(*args)
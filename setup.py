@@ -1,6 +1,6 @@
 # Use setuptools if we can
 try:
-    from setuptools.core import setup
+    from setuptools import setup
 except ImportError:
     from distutils.core import setup
 
@@ -24,6 +24,11 @@ setup(
     author_email='turnout-elections@groups.google.com',
     install_requires=[
     ],
+    # BatchMajorityJudgementCount, BatchVoteAggregator and ballot files use
+    # numpy if it is installed and fall back to pure Python if not
+    extras_require={
+        'batch': ['numpy'],
+    },
     url='https://github.com/devfort/turnout-election-schemes',
     classifiers=[
         'Intended Audience :: Developers',
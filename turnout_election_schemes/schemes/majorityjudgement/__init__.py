@@ -1,4 +1,10 @@
 from .scheme import Scheme
 from .count import MajorityJudgementCount
+from .batch_count import BatchMajorityJudgementCount
+from .live_count import LiveMajorityJudgementCount
 from .vote_aggregator import VoteAggregator
+from .batch_vote_aggregator import BatchVoteAggregator
+from .partial_tally import PartialTally
+from .ballot_file import BallotFile, write_ballot_file
+from .projection import Projector
 from .runner import Runner
@@ -31,6 +31,7 @@ This module provides a type which wraps a tally of grades and is then ordered
 in terms of the majority judgement. It may then be used to implement a voting
 procedure by assigning each candidate their tally and taking the maximum.
 """
+from bisect import bisect_right
 
 
 def pop_median(tally):
@@ -51,32 +52,188 @@ def pop_median(tally):
     return result
 
 
+# Markers for how the pair of grades after a run of identical pairs compares
+# to the pair in that run. See sort_key for why these are ordered this way.
+_DOWN, _LAST, _UP = 0, 1, 2
+
+
+def sort_key(tally):
+    return sort_key_and_gauge(tally)[0]
+
+
+def sort_key_and_gauge(tally):
+    """
+    Return a tuple of (key, gauge) for a tally, which may be a sequence of
+    counts for each grade or a mapping from grades to counts. The gauge is the
+    majority gauge of the tally: a tuple of (median grade, number of votes
+    below the median, number of votes above the median), where the median is
+    the lower median which pop_median pops first (or grade 0 if there are no
+    votes).
+
+    The key is a tuple which orders tallies of the same size exactly as comparing
+    the sequences of grades produced by repeatedly calling pop_median would,
+    but which is computed in a single pass over the grades.
+
+    If the sorted grades are x[0..n-1] and k = n // 2, pop_median produces
+    x[k] first when n is odd, and then the pairs (x[k-1], x[k+1]),
+    (x[k-2], x[k+2]), ... (or (x[k-1], x[k]), (x[k-2], x[k+1]), ... when n is
+    even), always taking the lower grade of a pair first. Going outwards the
+    lower grades never increase and the upper grades never decrease, so the
+    pairs form at most two runs per grade and we record each run as
+    (lower, upper, marker, length).
+
+    Two candidates whose runs match up to a point differ at the first run
+    where one of them moves on to a different pair. If that pair is lower
+    (_DOWN) staying in the run longer is better; if it is higher (_UP)
+    leaving sooner is better, and a run which ends the sequence (_LAST) sits
+    between the two.
+    """
+    if hasattr(tally, 'items'):
+        occupied = sorted((grade, count) for grade, count in tally.items() if count)
+    else:
+        occupied = [(grade, count) for grade, count in enumerate(tally) if count]
+
+    return occupied_sort_key_and_gauge(
+        [grade for grade, _ in occupied],
+        [count for _, count in occupied])
+
+
+def occupied_sort_key_and_gauge(grades, counts):
+    """
+    sort_key_and_gauge for a tally given as the grades which have any votes,
+    in increasing order, and the (non-zero) number of votes for each. Only the
+    occupied grades are looked at, and the medians are found by bisecting
+    their running totals, so the work done does not depend on how wide the
+    scale of grades is.
+    """
+    running_totals = []
+    total = 0
+    for count in counts:
+        total += count
+        running_totals.append(total)
+
+    if not total:
+        return (), (0, 0, 0)
+
+    def index_of(position):
+        return bisect_right(running_totals, position)
+
+    key = []
+    half = total // 2
+    if total % 2:
+        key.append(grades[index_of(half)])
+        lower_position, upper_position = half - 1, half + 1
+    else:
+        lower_position, upper_position = half - 1, half
+
+    median = index_of((total - 1) // 2)
+    gauge = (
+        grades[median],
+        running_totals[median] - counts[median],
+        total - running_totals[median])
+
+    pairs_left = half
+    if pairs_left:
+        lower = index_of(lower_position)
+        lower_left = lower_position - (running_totals[lower] - counts[lower]) + 1
+        upper = index_of(upper_position)
+        upper_left = running_totals[upper] - upper_position
+
+    while pairs_left:
+        run = min(lower_left, upper_left, pairs_left)
+        pairs_left -= run
+        lower_left -= run
+        upper_left -= run
+
+        if not pairs_left:
+            key.extend((grades[lower], grades[upper], _LAST, 0))
+        elif not lower_left:
+            key.extend((grades[lower], grades[upper], _DOWN, run))
+        else:
+            key.extend((grades[lower], grades[upper], _UP, -run))
+
+        if pairs_left and not lower_left:
+            lower -= 1
+            lower_left = counts[lower]
+        if pairs_left and not upper_left:
+            upper += 1
+            upper_left = counts[upper]
+
+    return tuple(key), gauge
+
+
+# Tallies with more grades than this are stored as just their occupied grades.
+SPARSE_GRADES = 16
+
+
 class MajorityJudgement(object):
     """
     Objects of type MajorityJudgement support comparison and ordering options
-    as per the ordering of the described voting algorithm. They expose no other
-    operations.
+    as per the ordering of the described voting algorithm. The key attribute
+    holds the result of sort_key for the tally, so they can also be sorted
+    with key=attrgetter('key') without comparing them pairwise. The gauge
+    attribute holds the majority gauge from the same pass over the tally.
+
+    The tally is kept in tuples of Python integers, which cannot overflow
+    however large the counts are, and the class has no per-instance __dict__. Tallies of up to SPARSE_GRADES grades are stored as
+    a count for every grade; wider ones, such as scores out of 100, are stored
+    as the occupied grades and their counts, so the memory used by each
+    object depends only on the number of different grades it was given.
     """
+    __slots__ = ('size', '_grades', '_tally', 'key', 'gauge')
+
     def __init__(self, tally):
         """
         Create a MajorityJudgement object from a tally of grades. Note that
         the votes are taken as tallies, not as a list of grades. i.e.
         [1,2,1] means that there is one vote each of grades 0 and 2 and 2 votes
-        of grade 1, not that there 2 votes of grade 1 and 1 of grade 2.
+        of grade 1, not that there 2 votes of grade 1 and 1 of grade 2. The
+        tally may also be a mapping from grades to counts, e.g. {0: 1, 1: 2,
+        2: 1}, which is always stored sparsely.
         """
-        for x in tally:
-            if type(x) is not int:
+        if hasattr(tally, 'items'):
+            occupied = sorted(tally.items())
+        else:
+            occupied = list(enumerate(tally))
+
+        for grade, x in occupied:
+            if type(x) not in (int, long) or type(grade) not in (int, long):
                 raise ValueError("Tally counts must be integers: %s" % tally)
-            if x < 0:
+            if x < 0 or grade < 0:
                 raise ValueError(
                     "Tally counts may not be negative: %s" % tally
                 )
-        tally = list(tally)
-        while tally and not tally[-1]:
-            tally.pop()
 
-        self.size = sum(tally)
-        self.tally = tuple(tally)
+        if hasattr(tally, 'items') or len(occupied) > SPARSE_GRADES:
+            occupied = [(grade, x) for grade, x in occupied if x]
+            self._grades = tuple(grade for grade, _ in occupied)
+            self._tally = tuple(x for _, x in occupied)
+        else:
+            tally = [x for _, x in occupied]
+            while tally and not tally[-1]:
+                tally.pop()
+            self._grades = None
+            self._tally = tuple(tally)
+
+        self.size = sum(self._tally)
+        if self._grades is None:
+            self.key, self.gauge = sort_key_and_gauge(self._tally)
+        else:
+            self.key, self.gauge = occupied_sort_key_and_gauge(self._grades, self._tally)
+
+    @property
+    def tally(self):
+        if self._grades is None:
+            return self._tally
+
+        tally = [0] * (self._grades[-1] + 1 if self._grades else 0)
+        for grade, x in zip(self._grades, self._tally):
+            tally[grade] = x
+        return tuple(tally)
+
+    @property
+    def is_sparse(self):
+        return self._grades is not None
 
     def __repr__(self):
         return "MajorityJudgement(tally=%s,)" % (
@@ -84,10 +241,12 @@ class MajorityJudgement(object):
         )
 
     def __eq__(self, other):
+        if self._grades is None and other._grades is None:
+            return self._tally == other._tally
         return self.tally == other.tally
 
     def __ne__(self, other):
-        return self.tally != other.tally
+        return not self == other
 
     def __lt__(self, other):
         return self._compare(other) < 0
@@ -102,12 +261,65 @@ class MajorityJudgement(object):
         return self._compare(other) >= 0
 
     def grade_list(self):
-        tally = list(self.tally)
+        return self.significant_grades(self.size)
+
+    def significant_grades(self, count):
+        """
+        Return the first count grades in order of significance, i.e. the
+        first count grades that repeatedly popping the median would produce.
+        """
         result = []
-        while tally:
-            result.append(pop_median(tally))
+        for grade, run_length in self.grade_runs(limit=count):
+            result.extend([grade] * run_length)
         return result
 
+    def grade_runs(self, limit=None):
+        """
+        Generate the grades in order of significance as (grade, run_length)
+        pairs, where run_length consecutive medians share the same grade. The
+        runs are produced lazily from our key, so at most limit grades (or
+        all of them if limit is None) are ever looked at.
+        """
+        remaining = self.size if limit is None else min(limit, self.size)
+        pending_grade, pending_length = None, 0
+
+        for grades, length in self._grade_pairs():
+            if not remaining:
+                break
+            for grade in grades:
+                if not remaining:
+                    break
+                run_length = min(length, remaining)
+                remaining -= run_length
+                if grade == pending_grade:
+                    pending_length += run_length
+                else:
+                    if pending_length:
+                        yield pending_grade, pending_length
+                    pending_grade, pending_length = grade, run_length
+
+        if pending_length:
+            yield pending_grade, pending_length
+
+    def _grade_pairs(self):
+        """
+        Generate the median sequence as (grades, length) pairs, meaning that
+        the grades tuple is repeated length times, from the runs in our key.
+        """
+        pairs_left = self.size // 2
+        if self.size % 2:
+            yield (self.key[0],), 1
+        runs = self.key[self.size % 2:]
+        for i in range(0, len(runs), 4):
+            lower, upper, marker, length = runs[i:i + 4]
+            length = pairs_left if marker == _LAST else abs(length)
+            pairs_left -= length
+            if lower == upper:
+                yield (lower,), 2 * length
+            else:
+                for _ in xrange(length):
+                    yield (lower, upper), 1
+
     def _compare(self, other):
         """
         Return an integer expressing the order relation between self and
@@ -120,16 +332,4 @@ class MajorityJudgement(object):
         if self is other:
             return 0
 
-        self_tallies = list(self.tally)
-        other_tallies = list(other.tally)
-
-        while self_tallies and other_tallies:
-            self_median = pop_median(self_tallies)
-            other_median = pop_median(other_tallies)
-            if self_median < other_median:
-                return -1
-            if other_median < self_median:
-                return 1
-        assert not self_tallies
-        assert not other_tallies
-        return 0
+        return cmp(self.key, other.key)
@@ -0,0 +1,196 @@
+"""
+A compact binary container for majority judgement ballots, so that recounts
+and reports don't have to parse the CSV export again. The file is:
+
+    a header: the magic string 'MJB1', the width in bytes of each grade (1 or
+    2), the number of grades, candidates and ballots, and the length of the
+    candidate names, as little-endian integers;
+    the candidate names as a JSON list in UTF-8, padded to a multiple of 8
+    bytes;
+    the grades, one column of number_of_ballots unsigned little-endian
+    integers for each candidate in turn.
+
+Storing the grades by candidate means each candidate's grades are contiguous,
+so with numpy they can be counted straight from the memory-mapped file.
+"""
+from array import array
+import csv
+from itertools import izip
+import json
+import mmap
+import struct
+import sys
+import tempfile
+from turnout_election_schemes.schemes.errors import IncompleteVoteError, InvalidVoteError
+from turnout_election_schemes.schemes.majorityjudgement.batch_vote_aggregator import BatchVoteAggregator
+from turnout_election_schemes.schemes.majorityjudgement.vote_aggregator import VoteAggregator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAGIC = 'MJB1'
+HEADER = struct.Struct('<4sBxxxIIQI4x')
+ALIGNMENT = 8
+TYPECODES = {1: 'B', 2: 'H'}
+
+def write_ballot_file(stream, path, chunk_size=65536):
+    """
+    Convert a CSV stream in the layout majorityjudgement.Runner reads (a
+    header row of a voter column and the candidate names, then a voter
+    identifier and a grade for each candidate on each row, blank meaning 0)
+    into a ballot file at path.
+
+    The grades are read chunk_size ballots at a time and each chunk's columns
+    are spooled to a temporary file, from which each candidate's column is
+    then copied out a chunk at a time, so memory use does not depend on the
+    number of ballots.
+    """
+    reader = csv.reader(stream)
+    candidate_names = next(reader)[1:]
+    max_grade = 0
+    chunk_sizes = []
+
+    spool = tempfile.TemporaryFile()
+    try:
+        columns = [array('H') for _ in candidate_names]
+        for row_index, row in enumerate(reader):
+            if not row:
+                continue
+            if len(row) - 1 < len(candidate_names):
+                raise IncompleteVoteError(
+                    "Ballot %d has %d grades for %d candidates" % (row_index, len(row) - 1, len(candidate_names)))
+
+            for column, grade in zip(columns, row[1:]):
+                grade = int(grade) if grade else 0
+                if grade < 0 or grade > 0xffff:
+                    raise InvalidVoteError("Ballot %d has grade %d, which cannot be stored" % (row_index, grade))
+                max_grade = max(max_grade, grade)
+                column.append(grade)
+
+            if len(columns[0]) == chunk_size:
+                _spool_chunk(spool, columns, chunk_sizes)
+                columns = [array('H') for _ in candidate_names]
+
+        if columns and len(columns[0]):
+            _spool_chunk(spool, columns, chunk_sizes)
+
+        width = 1 if max_grade <= 0xff else 2
+        names = json.dumps(candidate_names, separators=(',', ':')).encode('utf-8')
+
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, width, max_grade + 1, len(candidate_names), sum(chunk_sizes), len(names)))
+            f.write(names)
+            f.write('\0' * (-len(names) % ALIGNMENT))
+            for candidate_index in range(len(candidate_names)):
+                _copy_column(spool, f, candidate_index, len(candidate_names), chunk_sizes, width)
+    finally:
+        spool.close()
+
+def _spool_chunk(spool, columns, chunk_sizes):
+    """
+    Append a chunk's columns, one after another, to the spool file.
+    """
+    for column in columns:
+        column.tofile(spool)
+    chunk_sizes.append(len(columns[0]))
+
+def _copy_column(spool, f, candidate_index, number_of_candidates, chunk_sizes, width):
+    """
+    Copy one candidate's grades from each chunk in the spool file to f, in
+    the width and byte order of a ballot file.
+    """
+    chunk_start = 0
+    for chunk_size in chunk_sizes:
+        spool.seek(chunk_start + candidate_index * chunk_size * 2)
+        column = array('H')
+        column.fromfile(spool, chunk_size)
+        chunk_start += number_of_candidates * chunk_size * 2
+
+        if width == 1:
+            column = array('B', column)
+        if sys.byteorder == 'big':
+            column.byteswap()
+        column.tofile(f)
+
+class BallotFile(object):
+    """
+    A ballot file opened through mmap, so the grades are only read from disk
+    as they are counted:
+
+        with BallotFile(path) as ballots:
+            aggregated_votes = ballots.aggregate()
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError("'%s' is not a ballot file" % path)
+
+        magic, self.width, self.number_of_grades, number_of_candidates, self.number_of_ballots, names_length = \
+            HEADER.unpack_from(self._map)
+        if magic != MAGIC or self.width not in TYPECODES:
+            self.close()
+            raise ValueError("'%s' is not a ballot file" % path)
+
+        self.candidate_names = json.loads(self._map[HEADER.size:HEADER.size + names_length].decode('utf-8'))
+        self._grades_offset = HEADER.size + names_length + (-names_length % ALIGNMENT)
+
+        if (len(self.candidate_names) != number_of_candidates or
+                len(self._map) < self._grades_offset + number_of_candidates * self.number_of_ballots * self.width):
+            self.close()
+            raise ValueError("'%s' is truncated" % path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def grade_matrix(self):
+        """
+        A (ballots x candidates) numpy array of grades which is a view onto
+        the mapped file rather than a copy of it, so it must not be used after
+        the file is closed.
+        """
+        columns = numpy.frombuffer(
+            self._map,
+            dtype='<u%d' % self.width,
+            count=len(self.candidate_names) * self.number_of_ballots,
+            offset=self._grades_offset)
+        return columns.reshape((len(self.candidate_names), self.number_of_ballots)).T
+
+    def column(self, candidate_index):
+        """
+        The grades given to one candidate, copied into an array.
+        """
+        start = self._grades_offset + candidate_index * self.number_of_ballots * self.width
+        column = array(TYPECODES[self.width])
+        column.fromstring(self._map[start:start + self.number_of_ballots * self.width])
+        if sys.byteorder == 'big':
+            column.byteswap()
+        return column
+
+    def votes(self):
+        """
+        Generate each ballot as a tuple of grades, one for each candidate.
+        """
+        return izip(*[self.column(i) for i in range(len(self.candidate_names))])
+
+    def aggregate(self):
+        """
+        The grade counts for each candidate, as VoteAggregator.aggregate
+        returns them. With numpy each candidate's column is counted in place
+        in the mapped file, otherwise the votes are read one at a time.
+        """
+        if numpy is None:
+            return VoteAggregator(self.candidate_names, self.number_of_grades).aggregate(self.votes())
+
+        aggregator = BatchVoteAggregator(self.candidate_names, self.number_of_grades)
+        return aggregator.aggregate_matrix(self.grade_matrix())
@@ -0,0 +1,124 @@
+from itertools import groupby
+from operator import itemgetter
+from turnout_election_schemes.schemes.errors import IncompleteVoteError
+from turnout_election_schemes.schemes.majorityjudgement.algorithm import _DOWN, _LAST, _UP
+from turnout_election_schemes.schemes.majorityjudgement.count import MajorityJudgementCount, RankedCandidates
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class BatchMajorityJudgementCount(MajorityJudgementCount):
+    """
+    Ranks every candidate at once from a (candidates x grades) matrix of
+    tallies, using numpy to build the sort keys for all of the rows together
+    rather than wrapping each row in a MajorityJudgement object.
+
+    If numpy is not installed sort_candidates falls back to the pure Python
+    MajorityJudgementCount, which this produces identical results to.
+    """
+    def sort_candidates(self, candidates):
+        if numpy is None:
+            return super(BatchMajorityJudgementCount, self).sort_candidates(candidates)
+
+        self._ensure_all_votes_are_of_same_length(map(itemgetter(1), candidates))
+        if not candidates:
+            return (True, RankedCandidates(()))
+
+        order, rank_numbers = self.rank(numpy.array(map(itemgetter(1), candidates), dtype=numpy.int64))
+
+        ranked = RankedCandidates(
+            (candidates[i] for i, _ in group)
+                for _, group in groupby(zip(order, rank_numbers), key=itemgetter(1)))
+
+        return (not self._is_there_a_duplicate_winner(ranked), ranked)
+
+    def rank(self, tallies):
+        """
+        Takes a 2-D integer array with one row of grade counts per candidate
+        and returns a tuple of (order, rank_numbers) arrays. order holds the
+        row indices from the winner down, with candidates which tie kept in
+        their original order, and rank_numbers the position of each of those
+        candidates' tie group, starting from 0 for the winner(s).
+        """
+        keys = self.sort_keys(tallies)
+        if keys.shape[1]:
+            order = numpy.lexsort(-keys.T[::-1])
+        else:
+            order = numpy.arange(keys.shape[0])
+
+        sorted_keys = keys[order]
+        new_group = (sorted_keys[1:] != sorted_keys[:-1]).any(axis=1)
+        rank_numbers = numpy.concatenate(([0], numpy.cumsum(new_group)))[:len(order)]
+        return (order, rank_numbers)
+
+    def sort_keys(self, tallies):
+        """
+        Returns a matrix whose rows are algorithm.sort_key for each row of
+        tallies, padded with zeros to the same width. The runs of grade pairs
+        for all of the rows are found together, so we only loop once per run
+        (at most twice per grade) rather than once per candidate.
+        """
+        tallies = numpy.asarray(tallies, dtype=numpy.int64)
+        if tallies.ndim != 2:
+            raise ValueError("Tallies must be a (candidates x grades) matrix")
+        if (tallies < 0).any():
+            raise ValueError("Tally counts may not be negative")
+
+        number_of_candidates = tallies.shape[0]
+        totals = tallies.sum(axis=1)
+        if number_of_candidates == 0 or tallies.shape[1] == 0:
+            return numpy.zeros((number_of_candidates, 0), dtype=numpy.int64)
+        if (totals != totals[0]).any():
+            raise IncompleteVoteError()
+
+        total = int(totals[0])
+        half = total // 2
+        odd = total % 2
+        rows = numpy.arange(number_of_candidates)
+        running_totals = tallies.cumsum(axis=1)
+        starts = running_totals - tallies
+
+        columns = []
+        if odd:
+            columns.append(self._grades_at(running_totals, numpy.full(number_of_candidates, half)))
+
+        lower_index, upper_index = half - 1, half + odd
+        consumed = numpy.zeros(number_of_candidates, dtype=numpy.int64)
+        while True:
+            pairs_left = half - consumed
+            active = pairs_left > 0
+            if not active.any():
+                break
+
+            lower_position = numpy.maximum(lower_index - consumed, 0)
+            upper_position = numpy.minimum(upper_index + consumed, total - 1)
+            lower = self._grades_at(running_totals, lower_position)
+            upper = self._grades_at(running_totals, upper_position)
+            lower_left = lower_position - starts[rows, lower] + 1
+            upper_left = running_totals[rows, upper] - upper_position
+
+            run = numpy.minimum(numpy.minimum(lower_left, upper_left), pairs_left)
+            run[~active] = 0
+            consumed += run
+
+            last = active & (consumed == half)
+            down = active & ~last & (lower_left == run)
+            up = active & ~last & ~down
+
+            marker = numpy.where(down, _DOWN, numpy.where(up, _UP, _LAST))
+            length = numpy.where(down, run, numpy.where(up, -run, 0))
+            for column in (lower, upper, marker, length):
+                columns.append(numpy.where(active, column, 0))
+
+        if not columns:
+            return numpy.zeros((number_of_candidates, 0), dtype=numpy.int64)
+        return numpy.column_stack(columns).astype(numpy.int64)
+
+    def _grades_at(self, running_totals, positions):
+        """
+        The grade of the vote at the given position in each row's sorted
+        list of votes.
+        """
+        return (running_totals <= positions[:, numpy.newaxis]).sum(axis=1)
@@ -0,0 +1,80 @@
+from turnout_election_schemes.schemes.errors import IncompleteVoteError, InvalidVoteError
+from turnout_election_schemes.schemes.majorityjudgement.vote_aggregator import VoteAggregator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class BatchVoteAggregator(VoteAggregator):
+    """
+    Aggregates a dense matrix of votes with numpy, one row per voter and one
+    column per candidate, counting each candidate's grades with a single
+    bincount over their column instead of looping over the votes in Python.
+
+    The votes may be given as a 2-D integer array, or as any iterable of
+    votes, which is copied into one. Grades which are not whole numbers are
+    rejected with InvalidVoteError, as VoteAggregator rejects them. The
+    result is the same (candidate name, grade counts) tuples that
+    VoteAggregator.aggregate returns, which it falls back to if numpy is not
+    installed.
+    """
+    def aggregate(self, votes):
+        if numpy is None:
+            return super(BatchVoteAggregator, self).aggregate(votes)
+
+        return self.aggregate_matrix(self._vote_matrix(votes))
+
+    def aggregate_matrix(self, votes):
+        """
+        Takes a (voters x candidates) integer array of grades and returns the
+        grade counts for each candidate.
+        """
+        number_of_candidates = len(self.candidate_names)
+        if votes.ndim != 2 or votes.shape[1] < number_of_candidates:
+            raise IncompleteVoteError(
+                "Votes of shape %s do not have a grade for each of %d candidates" % (votes.shape, number_of_candidates))
+        votes = votes[:, :number_of_candidates]
+        if not (numpy.issubdtype(votes.dtype, numpy.integer) or votes.dtype == numpy.bool_):
+            raise InvalidVoteError("Votes of type %s do not have whole number grades" % votes.dtype)
+
+        # Check each column before it is counted rather than the whole matrix
+        # at once, and only a signed column can hold a negative grade
+        signed = numpy.issubdtype(votes.dtype, numpy.signedinteger)
+        aggregated_votes = []
+        for i, candidate_name in enumerate(self.candidate_names):
+            column = votes[:, i]
+            if len(column) and ((signed and column.min() < 0) or column.max() > self.number_of_grades - 1):
+                self._raise_invalid_vote(votes)
+            counts = numpy.bincount(column, minlength=self.number_of_grades)
+            aggregated_votes.append((candidate_name, tuple(counts.tolist())))
+
+        return tuple(aggregated_votes)
+
+    def _raise_invalid_vote(self, votes):
+        invalid = (votes < 0) | (votes > self.number_of_grades - 1)
+        ballot_index = invalid.any(axis=1).argmax()
+        raise InvalidVoteError(
+            "Ballot %d has grade %s, which is not between 0 and %d" % (
+                ballot_index,
+                votes[ballot_index][invalid[ballot_index]][0],
+                self.number_of_grades - 1))
+
+    def _vote_matrix(self, votes):
+        if isinstance(votes, numpy.ndarray):
+            return votes
+
+        # numpy picks the type that holds every grade, so that grades which
+        # are not whole numbers are rejected rather than truncated
+        number_of_candidates = len(self.candidate_names)
+        complete_votes = list(self._complete_votes(votes, number_of_candidates))
+        if not complete_votes or not number_of_candidates:
+            return numpy.zeros((len(complete_votes), number_of_candidates), dtype=numpy.int64)
+        return numpy.array(complete_votes)
+
+    def _complete_votes(self, votes, number_of_candidates):
+        for ballot_index, vote in enumerate(votes):
+            if len(vote) < number_of_candidates:
+                raise IncompleteVoteError(
+                    "Ballot %d has %d grades for %d candidates" % (ballot_index, len(vote), number_of_candidates))
+            yield vote[:number_of_candidates]
@@ -1,27 +1,123 @@
+import heapq
+from itertools import groupby
 from operator import itemgetter
 from turnout_election_schemes.schemes.errors import NoWinnerError, IncompleteVoteError
 from turnout_election_schemes.schemes.majorityjudgement.algorithm import MajorityJudgement as MJCandidate
 
+class RankedCandidates(tuple):
+    """
+    The candidates from the winner down, which can be used as a plain tuple.
+    tie_groups holds the same candidates grouped into tuples of candidates
+    which tie with each other, so the first group contains the winner(s).
+    """
+    def __new__(cls, tie_groups):
+        tie_groups = tuple(tuple(group) for group in tie_groups)
+        ranked = super(RankedCandidates, cls).__new__(
+            cls, (candidate for group in tie_groups for candidate in group))
+        ranked.tie_groups = tie_groups
+        return ranked
+
+    def __reduce__(self):
+        return (RankedCandidates, (self.tie_groups,))
+
 class MajorityJudgementCount(object):
     def sort_candidates(self, candidates):
-        self._ensure_all_votes_are_of_same_length(map(itemgetter(1), candidates))
+        """
+        Returns a tuple of (success, ranked candidates). The ranked candidates
+        are a RankedCandidates tuple, whose tie_groups give the ties at every
+        rank, and success is False if there is more than one winner.
+        """
+        succeeded, ranked, _ = self._rank(candidates, self._sort_keys(candidates))
+
+        return (succeeded, ranked)
+
+    def profile_candidates(self, candidates):
+        """
+        Rank the candidates as sort_candidates does, and also return the
+        profile of each candidate, from the same pass over their tallies.
+
+        Returns a tuple of (success, ranked candidates, profiles), where the
+        profiles are in the same order as the ranked candidates. Each one is
+        a dict of the candidate's median 'grade', their 'order' in the
+        ranking, and the shares of their votes 'above' and 'below' the median
+        (their majority gauge).
+        """
+        mj_candidates = self._mj_candidates(candidates)
+
+        succeeded, ranked, order = self._rank(candidates, [c.key for c in mj_candidates])
+
+        profiles = tuple(self._profile(mj_candidates[i], n) for n, i in enumerate(order))
+
+        return (succeeded, ranked, profiles)
+
+    def select_top(self, candidates, k):
+        """
+        Return the top k candidates in order without sorting the rest, in the
+        same (success, candidates) form as sort_candidates. Here success is
+        False if the kth candidate ties with the one after it, so the top k
+        cannot be chosen; for k=1 that is the same as a duplicate winner.
+        """
+        if k < 1:
+            raise ValueError("Must select at least one candidate, not %s" % k)
+
+        keys = self._sort_keys(candidates)
 
-        mj_candidates = []
-        for c in candidates:
-            mj_candidate = MJCandidate(c[1])
-            mj_candidate.original_tuple = c
-            mj_candidates.append(mj_candidate)
+        order = heapq.nlargest(k + 1, range(len(candidates)), key=keys.__getitem__)
 
-        sorted_candidates = sorted(mj_candidates, reverse=True)
+        tied = len(order) > k and keys[order[k - 1]] == keys[order[k]]
 
-        duplicate = self._is_there_a_duplicate_winner(sorted_candidates)
+        return (not tied, tuple(candidates[i] for i in order[:k]))
 
-        return (not duplicate, tuple(c.original_tuple for c in sorted_candidates))
+    def _rank(self, candidates, keys):
+        order = sorted(range(len(candidates)), key=keys.__getitem__, reverse=True)
+
+        ranked = RankedCandidates(
+            (candidates[i] for i in group)
+                for _, group in groupby(order, key=keys.__getitem__))
+
+        return (not self._is_there_a_duplicate_winner(ranked), ranked, order)
+
+    def _profile(self, mj_candidate, order):
+        median, below, above = mj_candidate.gauge
+        size = mj_candidate.size or 1
+
+        return {
+                'grade': median,
+                'order': order,
+                'above': float(above) / size,
+                'below': float(below) / size
+                }
+
+    def _mj_candidates(self, candidates):
+        """
+        Each candidate's tally as an MJCandidate, in the same order as the
+        candidates. Every tally must have the same number of grades and the
+        same total, since each voter grades every candidate.
+        """
+        self._ensure_all_votes_are_of_same_length(map(itemgetter(1), candidates))
+
+        mj_candidates = [MJCandidate(c[1]) for c in candidates]
+        self._ensure_all_votes_have_same_total(mj_candidates)
+
+        return mj_candidates
+
+    def _sort_keys(self, candidates):
+        """
+        The majority judgement sort key of each candidate's tally, in the same
+        order as the candidates.
+        """
+        return [c.key for c in self._mj_candidates(candidates)]
 
     def _ensure_all_votes_are_of_same_length(self, votes):
         unique_vote_sizes = set(map(len, votes))
         if len(unique_vote_sizes) > 1:
             raise IncompleteVoteError()
 
-    def _is_there_a_duplicate_winner(self, sorted_items):
-        return len(sorted_items) >= 2 and not cmp(sorted_items[0], sorted_items[1])
+    def _ensure_all_votes_have_same_total(self, mj_candidates):
+        unique_totals = set(c.size for c in mj_candidates)
+        if len(unique_totals) > 1:
+            raise IncompleteVoteError(
+                "Candidates have different numbers of votes: %s" % ', '.join(map(str, sorted(unique_totals))))
+
+    def _is_there_a_duplicate_winner(self, ranked):
+        return len(ranked) >= 2 and len(ranked.tie_groups[0]) > 1
@@ -0,0 +1,96 @@
+import json
+import re
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+SEPARATOR = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*')
+
+def iterate_json_array(stream, chunk_size=65536, max_element_size=1048576):
+    """
+    Generate the elements of the JSON array in a file-like stream, such as
+    [[1, 0, 2], [4, 4, 3], ...], decoding each one as soon as it has been
+    read. The stream is read chunk_size characters at a time and only the
+    chunk holding the current element is kept, so memory use does not depend
+    on the length of the array.
+
+    Raises ValueError if the stream is not a JSON array. An element which
+    cannot be decoded is only read further, in case it was cut off at the end
+    of a chunk, until max_element_size characters of it have been read.
+    """
+    return iter(_JsonArrayReader(stream, chunk_size, max_element_size))
+
+class _JsonArrayReader(object):
+    def __init__(self, stream, chunk_size, max_element_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.max_element_size = max_element_size
+        self.buffer = ''
+        self.position = 0
+
+    def __iter__(self):
+        if self._peek() != '[':
+            raise ValueError("Expected a JSON array")
+        self.position += 1
+        if self._peek() == ']':
+            self.position += 1
+            self._check_end()
+            return
+
+        raw_decode = json.JSONDecoder().raw_decode
+        element_index = 0
+        while True:
+            try:
+                element, end = raw_decode(self.buffer, self.position)
+            except ValueError:
+                # The element may be cut off at the end of the chunk, but
+                # once it is too long to be one it is not read any further
+                if len(self.buffer) - self.position < self.max_element_size and self._read():
+                    continue
+                raise ValueError("Could not decode element %d of the JSON array" % element_index)
+
+            separator = SEPARATOR.match(self.buffer, end)
+            if separator is None and WHITESPACE.match(self.buffer, end).end() < len(self.buffer):
+                raise ValueError("Expected ',' or ']' after element %d of the JSON array" % element_index)
+            if separator is None or separator.end() == len(self.buffer):
+                # A number at the end of the chunk may carry on into the
+                # next one, and the separator may not have been read yet
+                if self._read():
+                    continue
+                if separator is None:
+                    raise ValueError("Expected ',' or ']' after element %d of the JSON array" % element_index)
+
+            yield element
+            element_index += 1
+            self.position = separator.end()
+            if separator.group(1) == ']':
+                break
+
+        self._check_end()
+
+    def _check_end(self):
+        if self._peek():
+            raise ValueError("Unexpected data after the JSON array")
+
+    def _peek(self):
+        """
+        Skip any whitespace and return the next character, or '' at the end
+        of the stream.
+        """
+        while True:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._read():
+                return ''
+
+    def _read(self):
+        """
+        Drop what has been decoded from the buffer and add the next chunk of
+        the stream to it. Returns False at the end of the stream.
+        """
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            return False
+
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
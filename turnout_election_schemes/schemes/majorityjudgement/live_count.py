@@ -0,0 +1,116 @@
+from bisect import bisect_left, insort
+from itertools import groupby
+from turnout_election_schemes.schemes.errors import IncompleteVoteError, InvalidVoteError
+from turnout_election_schemes.schemes.majorityjudgement.algorithm import sort_key
+from turnout_election_schemes.schemes.majorityjudgement.count import RankedCandidates
+
+class LiveMajorityJudgementCount(object):
+    """
+    Keeps a running majority judgement ranking while ballots are still
+    arriving. Each ballot is a tuple with a grade for every candidate, as
+    passed to VoteAggregator.aggregate.
+
+    Adding, retracting or replacing a ballot updates the tallies it touches
+    and recomputes only those candidates' sort keys, in
+    O(candidates x grades). Each candidate whose key changed is taken out of
+    the standing order and bisected back in, so reading the standings is
+    just returning the stored result.
+    """
+    def __init__(self, candidate_names, number_of_grades):
+        self.candidate_names = tuple(candidate_names)
+        self.number_of_grades = number_of_grades
+        self.number_of_ballots = 0
+
+        self._tallies = [[0] * number_of_grades for _ in self.candidate_names]
+        self._keys = [sort_key(tally) for tally in self._tallies]
+        # (key, -index) for each candidate from the bottom of the order up,
+        # so that tied candidates stay in their original order from the top
+        self._ranking = sorted((key, -i) for i, key in enumerate(self._keys))
+        self._update_standings()
+
+    def add_ballot(self, ballot):
+        self._check_ballot(ballot)
+        for tally, grade in zip(self._tallies, ballot):
+            tally[grade] += 1
+        self.number_of_ballots += 1
+        self._update_keys(range(len(self.candidate_names)))
+
+    def retract_ballot(self, ballot):
+        """
+        Remove a ballot which was previously added, e.g. because the voter
+        has changed their mind.
+        """
+        self._check_ballot(ballot)
+        self._check_was_added(ballot, range(len(self.candidate_names)))
+        for tally, grade in zip(self._tallies, ballot):
+            tally[grade] -= 1
+        self.number_of_ballots -= 1
+        self._update_keys(range(len(self.candidate_names)))
+
+    def replace_ballot(self, old_ballot, new_ballot):
+        """
+        Replace a ballot which was previously added with another, e.g. when a
+        voter changes some of their grades. Only the candidates whose grade
+        changed are recomputed.
+        """
+        self._check_ballot(old_ballot)
+        self._check_ballot(new_ballot)
+        changed = [
+            i for i in range(len(self.candidate_names))
+                if old_ballot[i] != new_ballot[i]]
+        self._check_was_added(old_ballot, changed)
+        for i in changed:
+            self._tallies[i][old_ballot[i]] -= 1
+            self._tallies[i][new_ballot[i]] += 1
+        self._update_keys(changed)
+
+    def standings(self):
+        """
+        The current ranking, in the same (success, sorted candidates) form
+        that MajorityJudgementCount.sort_candidates returns.
+        """
+        return self._standings
+
+    def _check_ballot(self, ballot):
+        if len(ballot) < len(self.candidate_names):
+            raise IncompleteVoteError()
+        for grade in ballot[:len(self.candidate_names)]:
+            if grade < 0 or grade > self.number_of_grades - 1:
+                raise InvalidVoteError()
+
+    def _check_was_added(self, ballot, candidates):
+        for i in candidates:
+            if not self._tallies[i][ballot[i]]:
+                raise ValueError("Ballot %s was never added to the count" % (ballot,))
+
+    def _update_keys(self, candidates):
+        changed = False
+        for i in candidates:
+            key = sort_key(self._tallies[i])
+            if key != self._keys[i]:
+                self._move(i, key)
+                changed = True
+
+        if changed:
+            self._update_standings()
+
+    def _move(self, candidate, key):
+        """
+        Take the candidate out of the standing order and bisect them back in
+        at the place for their new key.
+        """
+        ranking = self._ranking
+        del ranking[bisect_left(ranking, (self._keys[candidate], -candidate))]
+        self._keys[candidate] = key
+        insort(ranking, (key, -candidate))
+
+    def _update_standings(self):
+        keys = self._keys
+        order = [-negated_index for _, negated_index in reversed(self._ranking)]
+
+        ranked = RankedCandidates(
+            ((self.candidate_names[i], tuple(self._tallies[i])) for i in group)
+                for _, group in groupby(order, key=keys.__getitem__))
+
+        duplicate = len(ranked) >= 2 and len(ranked.tie_groups[0]) > 1
+        self._standings = (not duplicate, ranked)
@@ -0,0 +1,126 @@
+import json
+import struct
+from turnout_election_schemes.schemes.majorityjudgement.vote_aggregator import VoteAggregator
+
+class PartialTally(object):
+    """
+    The grade counts for every candidate from some subset of the votes, e.g.
+    those held by one polling back-end. Partial tallies of the same
+    candidates can be merged in any order and grouping, and serialized to a
+    compact binary form to be sent between processes or machines, so that
+    each shard of the votes can be aggregated where it is stored:
+
+        shards = [PartialTally.from_votes(names, 5, votes) for votes in ...]
+        total = reduce(PartialTally.merge, shards)
+        MajorityJudgementCount().sort_candidates(total.aggregate())
+
+    Merging tallies with different numbers of grades pads the shorter ones
+    with zero counts for the extra grades.
+    """
+    MAGIC = 'MJT1'
+    HEADER = struct.Struct('<4sIII')
+
+    def __init__(self, candidate_names, grade_counts):
+        self.candidate_names = tuple(candidate_names)
+        self.grade_counts = tuple(tuple(counts) for counts in grade_counts)
+
+        if len(self.grade_counts) != len(self.candidate_names):
+            raise ValueError("There must be grade counts for each of the %d candidates" % len(self.candidate_names))
+        if len(set(map(len, self.grade_counts))) > 1:
+            raise ValueError("Every candidate must have the same number of grades")
+
+    @classmethod
+    def from_votes(cls, candidate_names, number_of_grades, votes):
+        return cls.from_aggregate(VoteAggregator(candidate_names, number_of_grades).aggregate(votes))
+
+    @classmethod
+    def from_aggregate(cls, aggregated_votes):
+        """
+        Create a partial tally from (candidate name, grade counts) tuples, as
+        returned by VoteAggregator.aggregate. Counts which are shorter than
+        the others are padded with zeros for the missing higher grades.
+        """
+        aggregated_votes = [(name, tuple(counts)) for name, counts in aggregated_votes]
+        number_of_grades = max([0] + [len(counts) for _, counts in aggregated_votes])
+
+        return cls(
+            [name for name, _ in aggregated_votes],
+            [counts + (0,) * (number_of_grades - len(counts)) for _, counts in aggregated_votes])
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < cls.HEADER.size:
+            raise ValueError("Not a serialized partial tally")
+
+        magic, names_length, number_of_candidates, number_of_grades = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a serialized partial tally")
+
+        offset = cls.HEADER.size
+        if len(data) != offset + names_length + 8 * number_of_candidates * number_of_grades:
+            raise ValueError("Serialized partial tally is truncated")
+
+        candidate_names = json.loads(data[offset:offset + names_length].decode('utf-8'))
+        offset += names_length
+
+        counts = struct.unpack_from('<%dQ' % (number_of_candidates * number_of_grades), data, offset)
+        return cls(candidate_names, [
+            counts[i * number_of_grades:(i + 1) * number_of_grades]
+                for i in range(number_of_candidates)])
+
+    @property
+    def number_of_grades(self):
+        return len(self.grade_counts[0]) if self.grade_counts else 0
+
+    def aggregate(self):
+        """
+        The grade counts as (candidate name, grade counts) tuples, as returned
+        by VoteAggregator.aggregate and taken by MajorityJudgementCount.
+        """
+        return tuple(zip(self.candidate_names, self.grade_counts))
+
+    def merge(self, other):
+        """
+        Return a new partial tally holding the votes from both this one and
+        other, which must be for the same candidates in the same order.
+        """
+        if self.candidate_names != other.candidate_names:
+            raise ValueError("Cannot merge tallies for different candidates")
+
+        number_of_grades = max(self.number_of_grades, other.number_of_grades)
+        return PartialTally(self.candidate_names, [
+            self._add_counts(self._padded(a, number_of_grades), self._padded(b, number_of_grades))
+                for a, b in zip(self.grade_counts, other.grade_counts)])
+
+    def to_bytes(self):
+        """
+        Serialize to a header, the candidate names as JSON and the grade
+        counts as little-endian unsigned 64-bit integers.
+        """
+        names = json.dumps(self.candidate_names, separators=(',', ':')).encode('utf-8')
+        counts = [count for counts in self.grade_counts for count in counts]
+
+        return (
+            self.HEADER.pack(self.MAGIC, len(names), len(self.candidate_names), self.number_of_grades) +
+            names +
+            struct.pack('<%dQ' % len(counts), *counts))
+
+    def __eq__(self, other):
+        return (
+            self.candidate_names == other.candidate_names and
+            self.grade_counts == other.grade_counts)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "PartialTally(candidate_names=%s, grade_counts=%s)" % (
+            self.candidate_names,
+            self.grade_counts,
+        )
+
+    def _padded(self, counts, number_of_grades):
+        return tuple(counts) + (0,) * (number_of_grades - len(counts))
+
+    def _add_counts(self, a, b):
+        return tuple(x + y for x, y in zip(a, b))
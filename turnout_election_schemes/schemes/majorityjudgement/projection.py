@@ -0,0 +1,189 @@
+import math
+import random as _random
+from turnout_election_schemes.schemes.majorityjudgement.count import MajorityJudgementCount
+from turnout_election_schemes.schemes.majorityjudgement.vote_aggregator import VoteAggregator
+
+class Projection(object):
+    """
+    The result of projecting a count. ranked and succeeded are as returned by
+    MajorityJudgementCount.sort_candidates for the ballots counted so far,
+    and bounds maps each candidate name to a (lowest, highest) range of
+    grades which contains the median of the full count with the requested
+    confidence. exact is True if every ballot was counted, in which case the
+    bounds are just the medians.
+    """
+    def __init__(self, succeeded, ranked, bounds, ballots_counted, exact):
+        self.succeeded = succeeded
+        self.ranked = ranked
+        self.bounds = bounds
+        self.ballots_counted = ballots_counted
+        self.exact = exact
+
+    def winner(self):
+        return self.ranked[0][0]
+
+    def __repr__(self):
+        return "Projection(winner=%r, ballots_counted=%d, exact=%s)" % (
+            self.winner(),
+            self.ballots_counted,
+            self.exact,
+        )
+
+class Projector(object):
+    """
+    Projects the winner of a majority judgement count from some of the
+    ballots, stopping as soon as the winner's median grade is separated from
+    every other candidate's. Since candidates are ranked on their median
+    grade first, the winner of the full count is then the projected winner.
+
+    The bounds on each candidate's median are the exact distribution-free
+    ones from the order statistics of the ballots counted, using the
+    binomial distribution rather than an approximation to it, so too few
+    ballots just give bounds of every grade. The chance of error
+    1 - confidence is shared out between the candidates and between the
+    checks made as the ballots are counted, the kth check getting
+    6 / (pi^2 k^2) of it, so that the projected winner is the winner of the
+    full count with at least the requested confidence however many checks it
+    takes. They assume the ballots counted are a uniform random sample of all
+    of them, so a prefix of the stream should only be used if the ballots
+    arrive in no particular order.
+
+    If the winner is never separated the projection falls back to counting
+    every ballot, so a projection is always returned.
+    """
+    def __init__(self, candidate_names, number_of_grades, confidence=0.95, checkpoint=1000):
+        self.candidate_names = candidate_names
+        self.number_of_grades = number_of_grades
+        self.confidence = confidence
+        self.checkpoint = checkpoint
+
+    def project_stream(self, votes):
+        """
+        Count the votes in order, checking every checkpoint ballots whether
+        the winner is separated yet.
+        """
+        aggregator = VoteAggregator(self.candidate_names, self.number_of_grades)
+        grade_counts = aggregator.empty_grade_counts()
+        ballots_counted = 0
+
+        for ballot_index, vote in enumerate(votes):
+            aggregator.count_vote(grade_counts, vote, ballot_index)
+            ballots_counted += 1
+
+            if ballots_counted % self.checkpoint == 0:
+                check = ballots_counted // self.checkpoint
+                error_rate = (1 - self.confidence) * 6 / (math.pi ** 2 * check ** 2)
+                projection = self._projection(grade_counts, ballots_counted, exact=False, error_rate=error_rate)
+                if self._winner_is_separated(projection):
+                    return projection
+
+        return self._projection(grade_counts, ballots_counted, exact=True)
+
+    def project_sample(self, votes, sample_size, random=_random):
+        """
+        Count a uniform random sample of sample_size of the votes, which must
+        be a sequence, and only count the rest if that does not separate the
+        winner.
+        """
+        if sample_size < len(votes):
+            sample = random.sample(votes, sample_size)
+            projection = self._projection(self._grade_counts(sample), sample_size, exact=False, error_rate=1 - self.confidence)
+            if self._winner_is_separated(projection):
+                return projection
+
+        return self._projection(self._grade_counts(votes), len(votes), exact=True)
+
+    def median_bounds(self, counts, error_rate=None):
+        """
+        The (lowest, highest) grades between which the median of the full
+        count lies, from the grade counts of a sample, with a chance of
+        error_rate (by default 1 - confidence) shared out between the
+        candidates that the median of any of them does not.
+        """
+        if error_rate is None:
+            error_rate = 1 - self.confidence
+
+        size = sum(counts)
+        lowest_position = self._lowest_median_position(size, error_rate / max(1, len(self.candidate_names)))
+        if lowest_position is None:
+            return (0, self.number_of_grades - 1)
+
+        highest_position = size - 1 - lowest_position
+        return (self._grade_at(counts, lowest_position), self._grade_at(counts, highest_position))
+
+    def _projection(self, grade_counts, ballots_counted, exact, error_rate=None):
+        aggregated_votes = tuple(zip(self.candidate_names, map(tuple, grade_counts)))
+        succeeded, ranked = MajorityJudgementCount().sort_candidates(aggregated_votes)
+
+        if exact:
+            bounds = {name: (self._grade_at(counts, (sum(counts) - 1) // 2),) * 2 for name, counts in aggregated_votes}
+        else:
+            bounds = {name: self.median_bounds(counts, error_rate) for name, counts in aggregated_votes}
+
+        return Projection(succeeded, ranked, bounds, ballots_counted, exact)
+
+    def _winner_is_separated(self, projection):
+        if not projection.succeeded:
+            return False
+
+        winner_lowest, _ = projection.bounds[projection.winner()]
+        return all(
+            projection.bounds[name][1] < winner_lowest
+                for name, _ in projection.ranked[1:])
+
+    def _grade_counts(self, votes):
+        aggregator = VoteAggregator(self.candidate_names, self.number_of_grades)
+        return [counts for _, counts in aggregator.aggregate(votes)]
+
+    def _grade_at(self, counts, position):
+        running_total = 0
+        for grade, count in enumerate(counts):
+            running_total += count
+            if running_total > position:
+                return grade
+        return 0
+
+    def _lowest_median_position(self, size, error_rate):
+        """
+        The lowest position in a sample of size ballots whose grade is at
+        most the median of the full count, except with a chance of at most
+        error_rate / 2, or None if there is no such position. At least half
+        of the full count is at or below its median, so the grade there is
+        higher only if at most position ballots of the sample are, which is
+        no more likely for a sample without replacement than for the binomial
+        distribution. The highest position is the same distance from the
+        other end.
+
+        Hoeffding's inequality gives a position which is low enough, and we
+        then move up while the exact binomial tail allows.
+        """
+        if size == 0:
+            return None
+
+        position = max(0, int(math.floor(size / 2.0 - math.sqrt(size * math.log(2 / error_rate) / 2))))
+        tail, term = self._binomial_tail(size, position)
+        if tail > error_rate / 2:
+            return None
+
+        while position < (size - 1) // 2:
+            term *= float(size - position) / (position + 1)
+            if tail + term > error_rate / 2:
+                break
+            tail += term
+            position += 1
+        return position
+
+    def _binomial_tail(self, size, k):
+        """
+        The chance of at most k heads from size tosses of a fair coin, for k
+        below size / 2, summed down from k until the terms stop counting.
+        Returns that and the chance of exactly k heads.
+        """
+        chance = math.exp(
+            math.lgamma(size + 1) - math.lgamma(k + 1) - math.lgamma(size - k + 1) - size * math.log(2))
+        term, total = chance, 0.0
+        while k >= 0 and term > total * 1e-12:
+            total += term
+            term *= float(k) / (size - k + 1)
+            k -= 1
+        return (total, chance)
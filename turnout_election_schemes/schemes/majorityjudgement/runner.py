@@ -1,28 +1,168 @@
 from turnout_election_schemes.schemes.scheme_runner import SchemeRunner
 from turnout_election_schemes.schemes.election_results import ElectionResults
-from turnout_election_schemes.schemes.majorityjudgement import VoteAggregator, MajorityJudgementCount
+from turnout_election_schemes.schemes.errors import IncompleteVoteError, InvalidVoteError
+from turnout_election_schemes.schemes.majorityjudgement import MajorityJudgementCount
+from turnout_election_schemes.schemes.majorityjudgement.ballot_file import BallotFile
+from turnout_election_schemes.schemes.majorityjudgement.partial_tally import PartialTally
 import csv
+import multiprocessing
+import os
 
 class Runner(SchemeRunner):
     def run(self, stream):
+        """
+        Count the votes in a CSV stream whose header row is a voter column
+        followed by the candidate names, and whose other rows are a voter
+        identifier followed by a grade for each candidate (blank meaning 0).
+
+        Each row is added to the tally as it is read and the number of grades
+        grows with the highest grade seen, so only the tally is kept in memory.
+        """
+        reader = csv.reader(stream)
+        headers = next(reader)[1:]
+
+        grade_counts = _tally_rows(reader, len(headers))
+
+        return self._results(zip(headers, map(tuple, grade_counts)))
+
+    def run_contests(self, stream, contests, processes=None):
+        """
+        Count several independent contests from one CSV stream in the layout
+        run takes, where contests maps each contest's name to the header
+        names of its candidates' columns, e.g.
+
+            {'Lunch': ['Pizza', 'Burger'], 'Chair': ['Alice', 'Bob', 'Carol']}
+
+        Every column is tallied in a single read of the stream. Returns a
+        dict of contest name to ElectionResults, the same as running each
+        contest's columns on their own. If processes is more than one the
+        contests are ranked in that many worker processes.
+        """
         reader = csv.reader(stream)
         headers = next(reader)[1:]
-        vote_tuples = []
-        max_grade = 0
 
-        for row in reader:
-            row_votes = map(lambda s: int(s) if s else 0, row[1:])
-            max_grade = max(max_grade, max(row_votes))
+        columns = {}
+        for contest, candidates in contests.items():
+            if not candidates:
+                raise ValueError("Contest '%s' has no candidates" % contest)
+            missing = [c for c in candidates if c not in headers]
+            if missing:
+                raise ValueError("Contest '%s' has candidates with no column: %s" % (contest, ', '.join(missing)))
+            columns[contest] = [headers.index(c) for c in candidates]
+
+        grade_counts = _tally_rows(reader, len(headers))
+
+        work = [
+            (contest, _contest_votes(headers, grade_counts, indices))
+                for contest, indices in columns.items()]
+
+        if processes > 1 and len(work) > 1:
+            pool = multiprocessing.Pool(processes)
+            try:
+                results = pool.map(_rank_contest, work)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = map(_rank_contest, work)
+
+        return dict(zip(columns, results))
+
+    def run_tallies(self, stream):
+        """
+        Count grade counts which have already been aggregated, from a CSV
+        stream with a header row and then a row for each candidate of the
+        candidate name followed by the number of votes at each grade from 0
+        upwards (blank meaning 0), e.g.
+
+            candidate,0,1,2,3
+            Pizza,2,10,21,4
+            Burger,6,12,40
+
+        The header row is required, and must number the grades from 0, so
+        that a missing header is not mistaken for it and a candidate lost.
+        Every candidate must have the same total number of votes.
+        """
+        reader = csv.reader(stream)
+        header = next(reader, [])
+        if header[1:] != map(str, range(len(header) - 1)):
+            raise ValueError("The first row of tallies must be a header numbering the grades from 0, e.g. candidate,0,1,2")
+
+        tallies = (
+            (row[0], [int(count) if count else 0 for count in row[1:]])
+                for row in reader if row)
+
+        return self._results(PartialTally.from_aggregate(tallies).aggregate())
+
+    def run_files(self, paths, processes=None):
+        """
+        Count the votes from one or more CSV files in the same layout as run
+        takes, e.g. one file for each polling back-end, each with the same
+        header row.
 
-            vote_tuples.append(row_votes)
+        Each file is split into about as many byte ranges as there are
+        processes, which are parsed and tallied in separate worker processes
+        and then merged. A row belongs to the range its first byte is in, so
+        rows (but not the header) must not contain quoted line breaks.
+        """
+        processes = processes or multiprocessing.cpu_count()
 
-        aggregator = VoteAggregator(headers, max_grade + 1)
-        aggregated_votes = aggregator.aggregate(vote_tuples)
+        headers = None
+        work = []
+        for path in paths:
+            file_headers, data_start = self._read_headers(path)
+            if headers is None:
+                headers = file_headers
+            elif file_headers != headers:
+                raise ValueError("'%s' does not have the same candidates as '%s'" % (path, paths[0]))
 
-        scheme = MajorityJudgementScheme()
-        sorted_candidates = scheme.sort_candidates(aggregated_votes)
+            work.extend((path, start, end, headers) for start, end in self._byte_ranges(path, data_start, processes))
 
-        return ElectionResults([sorted_candidates[0][0]], sorted_candidates)
+        if processes > 1 and len(work) > 1:
+            pool = multiprocessing.Pool(processes)
+            try:
+                serialized_tallies = pool.map(_tally_byte_range, work)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            serialized_tallies = map(_tally_byte_range, work)
+
+        tallies = [PartialTally.from_bytes(tally) for tally in serialized_tallies]
+        aggregated_votes = reduce(PartialTally.merge, tallies, PartialTally(headers, [(0,)] * len(headers))).aggregate()
+
+        return self._results(aggregated_votes)
+
+    def run_ballot_file(self, path):
+        """
+        Count the votes in a binary ballot file, as written from a CSV file by
+        ballot_file.write_ballot_file.
+        """
+        with BallotFile(path) as ballots:
+            return self._results(ballots.aggregate())
+
+    def _results(self, aggregated_votes):
+        """
+        The outcome is every candidate who ties for first place, so it only
+        holds a single winner if the count succeeded.
+        """
+        succeeded, sorted_candidates = MajorityJudgementCount().sort_candidates(aggregated_votes)
+
+        return ElectionResults([name for name, _ in sorted_candidates.tie_groups[0]], sorted_candidates)
+
+    def _read_headers(self, path):
+        """
+        Returns the candidate names from the header row of the file and the
+        offset of the first row of votes.
+        """
+        with open(path, 'rb') as f:
+            header = f.readline()
+            return next(csv.reader([header]))[1:], f.tell()
+
+    def _byte_ranges(self, path, data_start, count):
+        size = os.path.getsize(path)
+        step = max(1, -(-(size - data_start) // count))
+        return [(start, min(start + step, size)) for start in range(data_start, size, step)]
 
     def plain_text_report(self, report):
         lines = []
@@ -38,3 +178,84 @@ class Runner(SchemeRunner):
             lines.append("\t%s %s| %s" % (candidate, ' '*(max_candidate_length-len(candidate)), tally))
 
         return '\n'.join(lines)
+
+def _tally_rows(rows, number_of_candidates, where=''):
+    """
+    Tally CSV rows of votes, each a voter identifier followed by a grade for
+    each candidate, where a blank grade counts as 0. The number of grades
+    grows to fit the highest grade seen, so the rows are only read once.
+    Returns the grade counts for each candidate, all of the same length.
+
+    Ballots are numbered from the first of the rows in error messages, and
+    where is added after the number to say where the rows came from.
+    """
+    grade_counts = [[0] for _ in range(number_of_candidates)]
+
+    for row_index, row in enumerate(rows):
+        if not row:
+            continue
+        if len(row) - 1 < number_of_candidates:
+            raise IncompleteVoteError(
+                "Ballot %d%s has %d grades for %d candidates" % (row_index, where, len(row) - 1, number_of_candidates))
+
+        for counts, grade in zip(grade_counts, row[1:]):
+            grade = int(grade) if grade else 0
+            if grade < 0:
+                raise InvalidVoteError("Ballot %d%s has negative grade %d" % (row_index, where, grade))
+            if grade >= len(counts):
+                counts.extend([0] * (grade + 1 - len(counts)))
+            counts[grade] += 1
+
+    number_of_grades = max([1] + map(len, grade_counts))
+    for counts in grade_counts:
+        counts.extend([0] * (number_of_grades - len(counts)))
+    return grade_counts
+
+def _contest_votes(headers, grade_counts, indices):
+    """
+    The aggregated votes for the columns at indices, with just enough grades
+    for the highest grade any of them was given.
+    """
+    number_of_grades = 1
+    for i in indices:
+        occupied = [grade for grade, count in enumerate(grade_counts[i]) if count]
+        if occupied:
+            number_of_grades = max(number_of_grades, occupied[-1] + 1)
+    return [(headers[i], tuple(grade_counts[i][:number_of_grades])) for i in indices]
+
+def _rank_contest(work):
+    """
+    Rank one contest's aggregated votes. Run in the worker processes of
+    Runner.run_contests.
+    """
+    contest, aggregated_votes = work
+    return Runner()._results(aggregated_votes)
+
+def _tally_byte_range(work):
+    """
+    Tally the rows starting in the byte range [start, end) of a CSV file,
+    returning a serialized PartialTally. Run in the worker processes of
+    Runner.run_files.
+    """
+    path, start, end, headers = work
+
+    with open(path, 'rb') as f:
+        where = " of those starting in bytes %d to %d of %s" % (start, end, path)
+        grade_counts = _tally_rows(csv.reader(_lines_starting_in(f, start, end)), len(headers), where)
+
+    return PartialTally(headers, grade_counts).to_bytes()
+
+def _lines_starting_in(f, start, end):
+    """
+    Generate the lines of f whose first byte is in [start, end). The byte
+    before start is read to find out whether a line starts at start.
+    """
+    f.seek(start - 1)
+    position = start - 1 + len(f.readline())
+
+    while position < end:
+        line = f.readline()
+        if not line:
+            break
+        position += len(line)
+        yield line
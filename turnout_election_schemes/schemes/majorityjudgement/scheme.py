@@ -1,5 +1,6 @@
-import math
 from turnout_election_schemes.schemes.majorityjudgement.count import MajorityJudgementCount
+from turnout_election_schemes.schemes.majorityjudgement.json_ballots import iterate_json_array
+from turnout_election_schemes.schemes.majorityjudgement.partial_tally import PartialTally
 from turnout_election_schemes.schemes.majorityjudgement.vote_aggregator import VoteAggregator
 
 class Scheme(object):
@@ -12,28 +13,47 @@ class Scheme(object):
         aggregator = VoteAggregator(candidate_ids, max_grade + 1)
         aggregated_votes = aggregator.aggregate(votes_as_json)
 
+        return self._count(aggregated_votes)
+
+    def perform_count_from_json_stream(self, candidate_ids, votes_stream, max_grade=4):
+        """
+        The same as perform_count, but the votes are read from a file-like
+        stream holding them as a JSON array, e.g. [[1, 0, 2], [4, 4, 3]].
+        Each vote is counted as soon as it has been decoded, so the votes are
+        never all in memory at once.
+        """
+        aggregator = VoteAggregator(candidate_ids, max_grade + 1)
+        aggregated_votes = aggregator.aggregate(iterate_json_array(votes_stream))
+
+        return self._count(aggregated_votes)
+
+    def perform_count_from_tallies(self, tallies):
+        """
+        Count grade counts which have already been aggregated, e.g. by the
+        system storing the votes, without going through the individual votes.
+
+        tallies maps each candidate id to that candidate's grade counts, i.e.
+        the number of votes at each grade from 0 upwards, so
+        {9: (0, 2, 0, 1), 17: (0, 1, 2, 0)} means candidate 9 got two 1s and
+        a 3. It may also be a sequence of (candidate id, grade counts) pairs,
+        which keeps tied candidates in that order. Counts may leave off
+        trailing zeros. Returns the same as perform_count.
+        """
+        if hasattr(tallies, 'items'):
+            tallies = tallies.items()
+
+        return self._count(PartialTally.from_aggregate(tallies).aggregate())
+
+    def _count(self, aggregated_votes):
         scheme = MajorityJudgementCount()
-        succeeded, result = scheme.sort_candidates(aggregated_votes)
+        succeeded, result, profiles = scheme.profile_candidates(aggregated_votes)
         return (
             succeeded,
-            { x[0]: self._candidate_dict(x[1], n) for n, x in enumerate(result) },
+            { x[0]: self._candidate_dict(x[1], profile) for x, profile in zip(result, profiles) },
             (result[0][0],)
         )
 
-    def _candidate_dict(self, counts, order):
-        median = self._median_grade(counts)
-
-        return {
-                'grade': median,
-                'order': order,
-                'counts': counts
-                }
-
-    def _median_grade(self, counts):
-        total_grades = sum(counts)
-        median_point = math.ceil(float(total_grades)/2)
-        total_so_far = 0
-        for score, count in enumerate(counts):
-            total_so_far += count
-            if total_so_far >= median_point:
-                return score
+    def _candidate_dict(self, counts, profile):
+        candidate_dict = dict(profile)
+        candidate_dict['counts'] = counts
+        return candidate_dict
@@ -0,0 +1,182 @@
+import random
+import unittest
+from turnout_election_schemes.schemes.majorityjudgement import algorithm
+from turnout_election_schemes.schemes.majorityjudgement.algorithm import MajorityJudgement, pop_median, sort_key, sort_key_and_gauge
+
+def reference_compare(tally_a, tally_b):
+    """
+    The original majority judgement comparison, which pops medians off both
+    tallies one vote at a time.
+    """
+    tally_a = list(tally_a)
+    tally_b = list(tally_b)
+    while tally_a and tally_b:
+        median_a = pop_median(tally_a)
+        median_b = pop_median(tally_b)
+        if median_a != median_b:
+            return cmp(median_a, median_b)
+    return 0
+
+def random_tally(random, number_of_grades, size):
+    tally = [0] * number_of_grades
+    for _ in range(size):
+        tally[random.randrange(number_of_grades)] += 1
+    return tally
+
+class TestSortKey(unittest.TestCase):
+    def test_empty_tally_has_empty_key(self):
+        self.assertEqual((), sort_key((0, 0, 0)))
+
+    def test_single_vote(self):
+        self.assertEqual((2,), sort_key((0, 0, 1)))
+
+    def test_key_orders_as_pop_median_on_random_tallies(self):
+        generator = random.Random(1234)
+        for _ in range(2000):
+            number_of_grades = generator.randint(1, 7)
+            size = generator.randint(1, 40)
+            tally_a = random_tally(generator, number_of_grades, size)
+            tally_b = random_tally(generator, number_of_grades, size)
+
+            self.assertEqual(
+                reference_compare(tally_a, tally_b),
+                cmp(sort_key(tally_a), sort_key(tally_b)),
+                "%s vs %s" % (tally_a, tally_b))
+
+    def test_key_orders_as_pop_median_on_skewed_tallies(self):
+        """
+        Long runs of the same grade on one side of the median are where the
+        key has to get the length of each run right.
+        """
+        generator = random.Random(4321)
+        for _ in range(1000):
+            number_of_grades = generator.randint(2, 5)
+            tally_a = [generator.choice((0, 1, 30)) for _ in range(number_of_grades)]
+            size = sum(tally_a)
+            if not size:
+                continue
+            tally_b = random_tally(generator, number_of_grades, size)
+
+            self.assertEqual(
+                reference_compare(tally_a, tally_b),
+                cmp(sort_key(tally_a), sort_key(tally_b)),
+                "%s vs %s" % (tally_a, tally_b))
+
+    def test_majority_judgement_comparisons_use_the_same_order(self):
+        generator = random.Random(99)
+        for _ in range(500):
+            tally_a = random_tally(generator, 5, 21)
+            tally_b = random_tally(generator, 5, 21)
+            expected = reference_compare(tally_a, tally_b)
+
+            a = MajorityJudgement(tally_a)
+            b = MajorityJudgement(tally_b)
+            self.assertEqual(expected < 0, a < b)
+            self.assertEqual(expected > 0, a > b)
+            self.assertEqual(expected <= 0, a <= b)
+            self.assertEqual(expected >= 0, a >= b)
+
+class TestMajorityJudgement(unittest.TestCase):
+    def test_grade_list_matches_popping_medians(self):
+        generator = random.Random(7)
+        for _ in range(500):
+            tally = random_tally(generator, generator.randint(1, 6), generator.randint(0, 30))
+            remaining = list(tally)
+            expected = []
+            while sum(remaining):
+                expected.append(pop_median(remaining))
+
+            self.assertEqual(expected, MajorityJudgement(tally).grade_list())
+
+    def test_key_is_computed_once(self):
+        calls = []
+        original = algorithm.occupied_sort_key_and_gauge
+        def counting_sort_key_and_gauge(grades, counts):
+            calls.append(list(counts))
+            return original(grades, counts)
+
+        algorithm.occupied_sort_key_and_gauge = counting_sort_key_and_gauge
+        try:
+            candidates = [MajorityJudgement((1, 2, 3)), MajorityJudgement((3, 2, 1)), MajorityJudgement({0: 2, 5: 4})]
+            sorted(candidates)
+            sorted(candidates, reverse=True)
+            [candidate.key for candidate in candidates]
+            candidates[0] == candidates[1]
+        finally:
+            algorithm.occupied_sort_key_and_gauge = original
+
+        self.assertEqual([[1, 2, 3], [3, 2, 1], [2, 4]], calls)
+        self.assertEqual(sort_key((1, 2, 3)), candidates[0].key)
+
+    def test_grade_runs_are_run_length_encoded_grade_list(self):
+        generator = random.Random(11)
+        for _ in range(500):
+            tally = random_tally(generator, generator.randint(1, 6), generator.randint(0, 30))
+            candidate = MajorityJudgement(tally)
+            runs = list(candidate.grade_runs())
+
+            expanded = []
+            for grade, run_length in runs:
+                expanded.extend([grade] * run_length)
+            self.assertEqual(candidate.grade_list(), expanded)
+            for (grade, _), (next_grade, _) in zip(runs, runs[1:]):
+                self.assertNotEqual(grade, next_grade)
+
+    def test_grade_runs_for_long_runs(self):
+        candidate = MajorityJudgement((0, 1000, 0, 2001))
+        self.assertEqual([(3, 1001), (1, 1), (3, 1)], list(candidate.grade_runs())[:3])
+
+    def test_significant_grades_are_truncated(self):
+        candidate = MajorityJudgement((2, 2, 6, 1, 2))
+        self.assertEqual(candidate.grade_list()[:4], candidate.significant_grades(4))
+        self.assertEqual([(2, 4)], list(candidate.grade_runs(limit=4)))
+        self.assertEqual(candidate.grade_list(), candidate.significant_grades(100))
+
+class TestSparseTallies(unittest.TestCase):
+    def test_wide_tallies_are_stored_sparsely(self):
+        self.assertFalse(MajorityJudgement([1] * 10).is_sparse)
+        self.assertTrue(MajorityJudgement([0] * 100 + [1]).is_sparse)
+        self.assertTrue(MajorityJudgement({3: 1}).is_sparse)
+
+    def test_sparse_tally_round_trips(self):
+        tally = [0] * 101
+        tally[5], tally[50], tally[99] = 2, 3, 1
+        candidate = MajorityJudgement(tally)
+        self.assertEqual(tuple(tally[:100]), candidate.tally)
+        self.assertEqual(candidate, MajorityJudgement({5: 2, 50: 3, 99: 1}))
+        self.assertEqual(candidate, MajorityJudgement(tally[:100]))
+
+    def test_mapping_gives_the_same_key_as_the_sequence(self):
+        generator = random.Random(3)
+        for _ in range(500):
+            tally = random_tally(generator, generator.randint(1, 101), generator.randint(0, 40))
+            mapping = {grade: count for grade, count in enumerate(tally) if count}
+            self.assertEqual(sort_key_and_gauge(tally), sort_key_and_gauge(mapping))
+
+    def test_sparse_and_dense_order_the_same(self):
+        generator = random.Random(8)
+        for _ in range(1000):
+            size = generator.randint(1, 25)
+            tally_a = random_tally(generator, 101, size)
+            tally_b = random_tally(generator, 101, size)
+            a, b = MajorityJudgement(tally_a), MajorityJudgement(tally_b)
+            self.assertTrue(a.is_sparse and b.is_sparse)
+            self.assertEqual(reference_compare(tally_a, tally_b), a._compare(b))
+
+            remaining = list(tally_a)
+            expected = [pop_median(remaining) for _ in range(size)]
+            self.assertEqual(expected, a.grade_list())
+
+    def test_counts_too_large_for_machine_integers(self):
+        large = 2 ** 70
+        for tally in ((large, 1, large + 2), {0: large, 1: 1, 2: large + 2}):
+            candidate = MajorityJudgement(tally)
+            self.assertEqual((large, 1, large + 2), candidate.tally)
+            self.assertEqual(2 * large + 3, candidate.size)
+            self.assertEqual((2, large + 1, 0), candidate.gauge)
+
+    def test_mapping_with_negative_count_is_rejected(self):
+        with self.assertRaises(ValueError):
+            MajorityJudgement({1: -1})
+        with self.assertRaises(ValueError):
+            MajorityJudgement({-1: 1})
@@ -0,0 +1,100 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from StringIO import StringIO
+from turnout_election_schemes.schemes.majorityjudgement import ballot_file
+from turnout_election_schemes.schemes.majorityjudgement.ballot_file import BallotFile, write_ballot_file
+from turnout_election_schemes.schemes.majorityjudgement.runner import Runner
+from turnout_election_schemes.schemes.errors import IncompleteVoteError
+
+class BallotFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'votes.mjb')
+
+        generator = random.Random(14)
+        self.csv = 'voter,Pizza,Chinese,Indian\r\n' + ''.join(
+            '%d,%s\r\n' % (i, ','.join(str(generator.randrange(6)) for _ in range(3)))
+                for i in range(300))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_header(self):
+        write_ballot_file(StringIO(self.csv), self.path)
+
+        with BallotFile(self.path) as ballots:
+            self.assertEqual(['Pizza', 'Chinese', 'Indian'], ballots.candidate_names)
+            self.assertEqual(6, ballots.number_of_grades)
+            self.assertEqual(300, ballots.number_of_ballots)
+            self.assertEqual(1, ballots.width)
+
+    def test_votes_round_trip(self):
+        write_ballot_file(StringIO('voter,A,B\r\n1,1,\r\n2,300,2\r\n'), self.path)
+
+        with BallotFile(self.path) as ballots:
+            self.assertEqual(2, ballots.width)
+            self.assertEqual(301, ballots.number_of_grades)
+            self.assertEqual([(1, 0), (300, 2)], list(ballots.votes()))
+
+    def test_same_results_as_csv(self):
+        write_ballot_file(StringIO(self.csv), self.path)
+
+        expected = Runner().run(StringIO(self.csv))
+        actual = Runner().run_ballot_file(self.path)
+
+        self.assertEqual(expected.outcome, actual.outcome)
+        self.assertEqual(expected.report, actual.report)
+
+    def test_same_results_without_numpy(self):
+        write_ballot_file(StringIO(self.csv), self.path)
+        expected = Runner().run(StringIO(self.csv))
+
+        numpy = ballot_file.numpy
+        ballot_file.numpy = None
+        try:
+            actual = Runner().run_ballot_file(self.path)
+        finally:
+            ballot_file.numpy = numpy
+
+        self.assertEqual(expected.report, actual.report)
+
+    def test_no_ballots(self):
+        write_ballot_file(StringIO('voter,A,B\r\n'), self.path)
+
+        with BallotFile(self.path) as ballots:
+            self.assertEqual((('A', (0,)), ('B', (0,))), ballots.aggregate())
+
+    def test_incomplete_row_raises_error(self):
+        with self.assertRaises(IncompleteVoteError):
+            write_ballot_file(StringIO('voter,A,B\r\n1,1,1\r\n2,1\r\n'), self.path)
+
+    def test_other_files_are_rejected(self):
+        with open(self.path, 'wb') as f:
+            f.write(self.csv)
+
+        with self.assertRaises(ValueError):
+            BallotFile(self.path)
+
+    def test_short_files_are_rejected(self):
+        write_ballot_file(StringIO(self.csv), self.path)
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        for length in (1, ballot_file.HEADER.size - 1, ballot_file.HEADER.size, len(data) - 1):
+            with open(self.path, 'wb') as f:
+                f.write(data[:length])
+            with self.assertRaises(ValueError):
+                BallotFile(self.path)
+
+    def test_writing_in_chunks_gives_the_same_file(self):
+        write_ballot_file(StringIO(self.csv), self.path)
+        with open(self.path, 'rb') as f:
+            expected = f.read()
+
+        for chunk_size in (1, 7, 300, 1000):
+            write_ballot_file(StringIO(self.csv), self.path, chunk_size)
+            with open(self.path, 'rb') as f:
+                self.assertEqual(expected, f.read())
@@ -0,0 +1,94 @@
+import random
+import unittest
+from turnout_election_schemes.schemes.majorityjudgement import batch_count
+from turnout_election_schemes.schemes.majorityjudgement.algorithm import sort_key
+from turnout_election_schemes.schemes.majorityjudgement.batch_count import BatchMajorityJudgementCount
+from turnout_election_schemes.schemes.majorityjudgement.count import MajorityJudgementCount
+from turnout_election_schemes.schemes.errors import IncompleteVoteError
+
+def random_candidates(generator, number_of_candidates, number_of_grades, number_of_voters):
+    candidates = []
+    for i in range(number_of_candidates):
+        tally = [0] * number_of_grades
+        for _ in range(number_of_voters):
+            tally[generator.randrange(number_of_grades)] += 1
+        candidates.append(('Candidate %d' % i, tuple(tally)))
+    return tuple(candidates)
+
+@unittest.skipIf(batch_count.numpy is None, 'numpy is not installed (it is the batch extra)')
+class TestBatchMajorityJudgementCount(unittest.TestCase):
+    def test_basic_larger_case(self):
+        chinese = ('Chinese', (12,40,6,8,7,26))
+        pizza = ('Pizza', (2,10,21,4,17,45))
+        indian = ('Indian', (10,4,33,33,2,17))
+        burger = ('Burger', (6,12,40,26,7,8))
+
+        input_data = (chinese, pizza, indian, burger)
+
+        expected_output = (pizza, indian, burger, chinese)
+
+        success, actual_output = BatchMajorityJudgementCount().sort_candidates(input_data)
+        self.assertEqual(expected_output, actual_output)
+        self.assertTrue(success)
+
+    def test_two_identical_winners(self):
+        smith = ('L. Smith', (2, 7, 5, 8, 3))
+        jones = ('Q. Jones', (11, 9, 2, 3, 0))
+        rogers = ('P. Rogers', (2, 7, 5, 8, 3))
+
+        success, actual_output = BatchMajorityJudgementCount().sort_candidates((smith, jones, rogers))
+        self.assertEqual((smith, rogers, jones), actual_output)
+        self.assertFalse(success)
+
+    def test_keys_match_sort_key(self):
+        generator = random.Random(3)
+        candidates = random_candidates(generator, 50, 6, 37)
+        keys = BatchMajorityJudgementCount().sort_keys([c[1] for c in candidates])
+
+        for (_, tally), row in zip(candidates, keys):
+            key = sort_key(tally)
+            self.assertEqual(key, tuple(row[:len(key)]))
+            self.assertFalse(row[len(key):].any())
+
+    def test_same_order_as_pure_python_count(self):
+        generator = random.Random(42)
+        for _ in range(200):
+            candidates = random_candidates(
+                generator,
+                generator.randint(1, 30),
+                generator.randint(1, 7),
+                generator.randint(0, 25))
+
+            expected_success, expected = MajorityJudgementCount().sort_candidates(candidates)
+            actual_success, actual = BatchMajorityJudgementCount().sort_candidates(candidates)
+
+            self.assertEqual(expected_success, actual_success)
+            self.assertEqual(expected, actual)
+            self.assertEqual(expected.tie_groups, actual.tie_groups)
+
+    def test_candidates_with_different_numbers_of_votes_raise_error(self):
+        with self.assertRaises(IncompleteVoteError):
+            BatchMajorityJudgementCount().rank([[1, 2, 3], [1, 2, 2]])
+
+    def test_rank_numbers(self):
+        order, rank_numbers = BatchMajorityJudgementCount().rank(
+            [[2, 2, 1], [0, 3, 2], [1, 2, 2], [0, 3, 2]])
+        self.assertEqual([1, 3, 2, 0], list(order))
+        self.assertEqual([0, 0, 1, 2], list(rank_numbers))
+
+class TestBatchMajorityJudgementCountFallback(unittest.TestCase):
+    def setUp(self):
+        self.numpy = batch_count.numpy
+        batch_count.numpy = None
+
+    def tearDown(self):
+        batch_count.numpy = self.numpy
+
+    def test_falls_back_to_pure_python_count(self):
+        pizza = ('Pizza', (1,1,3))
+        burger = ('Burger', (3,0,2))
+        veggie = ('Veggie', (2,2,1))
+
+        success, actual_output = BatchMajorityJudgementCount().sort_candidates((pizza, burger, veggie))
+        self.assertEqual((pizza, veggie, burger), actual_output)
+        self.assertTrue(success)
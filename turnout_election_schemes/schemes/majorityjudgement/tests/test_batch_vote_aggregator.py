@@ -0,0 +1,96 @@
+import random
+import unittest
+from turnout_election_schemes.schemes.majorityjudgement import batch_vote_aggregator
+from turnout_election_schemes.schemes.majorityjudgement.batch_vote_aggregator import BatchVoteAggregator
+from turnout_election_schemes.schemes.majorityjudgement.vote_aggregator import VoteAggregator
+from turnout_election_schemes.schemes.majorityjudgement.tests import test_voteaggregator
+from turnout_election_schemes.schemes.errors import IncompleteVoteError, InvalidVoteError
+
+numpy = batch_vote_aggregator.numpy
+
+@unittest.skipIf(numpy is None, 'numpy is not installed (it is the batch extra)')
+class TestBatchVoteAggregator(test_voteaggregator.TestVoteAggregator):
+    """
+    Runs all of the VoteAggregator tests against the numpy backend, as well
+    as the tests below.
+    """
+    def setUp(self):
+        self.candidates = ('Pizza', 'Chinese', 'Indian', 'Burger')
+        self.number_of_grades = 5
+
+        self.aggregator = BatchVoteAggregator(self.candidates, self.number_of_grades)
+
+    def test_matrix_of_votes(self):
+        # Arrange
+        all_votes = numpy.array([
+            (0, 4, 2, 4),
+            (1, 3, 3, 4),
+            (4, 1, 0, 4),
+            (0, 2, 1, 2)], dtype=numpy.uint8)
+
+        # Act
+        actual_output = self.aggregator.aggregate(all_votes)
+
+        # Assert
+        expected_output = (
+                ('Pizza',   (2, 1, 0, 0, 1)),
+                ('Chinese', (0, 1, 1, 1, 1)),
+                ('Indian',  (1, 1, 1, 1, 0)),
+                ('Burger',  (0, 0, 1, 0, 3))
+                )
+
+        self.assertEqual(expected_output, actual_output)
+
+    def test_matrix_with_too_few_columns_raises_error(self):
+        with self.assertRaises(IncompleteVoteError):
+            self.aggregator.aggregate(numpy.zeros((3, 3), dtype=numpy.int64))
+
+    def test_unsigned_matrix_with_grade_too_high_raises_error(self):
+        all_votes = numpy.zeros((10, 4), dtype=numpy.uint8)
+        all_votes[7, 2] = self.number_of_grades
+
+        with self.assertRaisesRegexp(InvalidVoteError, 'Ballot 7'):
+            self.aggregator.aggregate(all_votes)
+
+    def test_grade_far_too_high_raises_error(self):
+        with self.assertRaisesRegexp(InvalidVoteError, 'Ballot 1'):
+            self.aggregator.aggregate([(1, 2, 3, 4), (3, 10 ** 12, 0, 0)])
+
+    def test_rejects_the_same_malformed_ballots_as_vote_aggregator(self):
+        aggregators = (VoteAggregator(self.candidates, self.number_of_grades), self.aggregator)
+
+        for bad_grade in (1.5, 1.0, -1, 5, 10 ** 30, '1', None):
+            all_votes = [(1, 2, 3, 4), (0, bad_grade, 0, 0)]
+            for aggregator in aggregators:
+                with self.assertRaises(InvalidVoteError):
+                    aggregator.aggregate(all_votes)
+
+    def test_matrix_of_floats_raises_error(self):
+        with self.assertRaises(InvalidVoteError):
+            self.aggregator.aggregate(numpy.ones((3, 4)))
+
+    def test_same_counts_as_vote_aggregator(self):
+        generator = random.Random(8)
+        all_votes = [
+            tuple(generator.randrange(self.number_of_grades) for _ in self.candidates)
+                for _ in range(1000)]
+
+        expected_output = VoteAggregator(self.candidates, self.number_of_grades).aggregate(all_votes)
+
+        self.assertEqual(expected_output, self.aggregator.aggregate(all_votes))
+        self.assertEqual(expected_output, self.aggregator.aggregate(numpy.array(all_votes)))
+
+class TestBatchVoteAggregatorFallback(test_voteaggregator.TestVoteAggregator):
+    """
+    Runs all of the VoteAggregator tests against BatchVoteAggregator as if
+    numpy were not installed, when it falls back to VoteAggregator.
+    """
+    def setUp(self):
+        super(TestBatchVoteAggregatorFallback, self).setUp()
+        self.aggregator = BatchVoteAggregator(self.aggregator.candidate_names, self.aggregator.number_of_grades)
+
+        self.numpy = batch_vote_aggregator.numpy
+        batch_vote_aggregator.numpy = None
+
+    def tearDown(self):
+        batch_vote_aggregator.numpy = self.numpy
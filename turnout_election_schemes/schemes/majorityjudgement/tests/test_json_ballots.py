@@ -0,0 +1,53 @@
+import json
+import random
+import unittest
+from StringIO import StringIO
+from turnout_election_schemes.schemes.majorityjudgement.json_ballots import iterate_json_array
+
+class TestIterateJsonArray(unittest.TestCase):
+    def test_empty_array(self):
+        self.assertEqual([], list(iterate_json_array(StringIO(' [ ] \n'))))
+
+    def test_elements_split_across_every_chunk_size(self):
+        generator = random.Random(2)
+        ballots = [[generator.randrange(1000) for _ in range(4)] for _ in range(50)]
+        text = json.dumps(ballots, indent=1)
+
+        for chunk_size in range(1, 40):
+            self.assertEqual(ballots, list(iterate_json_array(StringIO(text), chunk_size)))
+
+    def test_numbers_split_across_chunks(self):
+        self.assertEqual([12345, 6.5e3, -7], list(iterate_json_array(StringIO('[12345,6.5e3,-7]'), 2)))
+
+    def test_reads_lazily(self):
+        stream = StringIO('[[1, 2], [3, 4], [5, 6]]')
+        elements = iterate_json_array(stream, 4)
+
+        self.assertEqual([1, 2], next(elements))
+        self.assertTrue(stream.tell() < len(stream.getvalue()))
+
+    def test_not_an_array_raises_error(self):
+        with self.assertRaises(ValueError):
+            list(iterate_json_array(StringIO('{"a": 1}')))
+
+    def test_truncated_array_raises_error(self):
+        with self.assertRaises(ValueError):
+            list(iterate_json_array(StringIO('[[1, 2], [3, 4]')))
+        with self.assertRaises(ValueError):
+            list(iterate_json_array(StringIO('[[1, 2], [3, ')))
+
+    def test_missing_separator_raises_error(self):
+        with self.assertRaises(ValueError):
+            list(iterate_json_array(StringIO('[[1, 2] [3, 4]]')))
+
+    def test_trailing_data_raises_error(self):
+        with self.assertRaises(ValueError):
+            list(iterate_json_array(StringIO('[[1, 2]] [')))
+
+    def test_bad_element_early_in_a_large_stream_is_not_read_to_the_end(self):
+        for bad_element in ('[1, x]', '[1, 2] [3, 4]'):
+            stream = StringIO('[[1, 2], %s, %s[5, 6]]' % (bad_element, '[1, 2], ' * 100000))
+
+            with self.assertRaises(ValueError):
+                list(iterate_json_array(stream, 64, 1024))
+            self.assertTrue(stream.tell() <= 1024 + 64)
@@ -0,0 +1,94 @@
+import random
+import unittest
+from turnout_election_schemes.schemes.majorityjudgement import live_count
+from turnout_election_schemes.schemes.majorityjudgement.count import MajorityJudgementCount
+from turnout_election_schemes.schemes.majorityjudgement.live_count import LiveMajorityJudgementCount
+from turnout_election_schemes.schemes.majorityjudgement.vote_aggregator import VoteAggregator
+from turnout_election_schemes.schemes.errors import IncompleteVoteError, InvalidVoteError
+
+class TestLiveMajorityJudgementCount(unittest.TestCase):
+    def setUp(self):
+        self.candidates = ('Pizza', 'Chinese', 'Indian', 'Burger')
+        self.number_of_grades = 5
+        self.count = LiveMajorityJudgementCount(self.candidates, self.number_of_grades)
+
+    def full_count(self, ballots):
+        aggregator = VoteAggregator(self.candidates, self.number_of_grades)
+        return MajorityJudgementCount().sort_candidates(aggregator.aggregate(ballots))
+
+    def test_standings_before_any_ballots(self):
+        self.assertEqual(self.full_count([]), self.count.standings())
+        self.assertEqual(0, self.count.number_of_ballots)
+
+    def test_standings_match_a_full_recount(self):
+        generator = random.Random(5)
+        ballots = []
+        for _ in range(300):
+            if ballots and generator.random() < 0.3:
+                ballot = ballots.pop(generator.randrange(len(ballots)))
+                self.count.retract_ballot(ballot)
+            else:
+                ballot = tuple(generator.randrange(self.number_of_grades) for _ in self.candidates)
+                ballots.append(ballot)
+                self.count.add_ballot(ballot)
+
+            expected_success, expected = self.full_count(ballots)
+            actual_success, actual = self.count.standings()
+            self.assertEqual(expected_success, actual_success)
+            self.assertEqual(expected.tie_groups, actual.tie_groups)
+            self.assertEqual(len(ballots), self.count.number_of_ballots)
+
+    def test_replacing_ballots_matches_a_full_recount(self):
+        generator = random.Random(6)
+        ballots = [
+            tuple(generator.randrange(self.number_of_grades) for _ in self.candidates)
+                for _ in range(50)]
+        for ballot in ballots:
+            self.count.add_ballot(ballot)
+
+        for _ in range(200):
+            index = generator.randrange(len(ballots))
+            new_ballot = list(ballots[index])
+            new_ballot[generator.randrange(len(self.candidates))] = generator.randrange(self.number_of_grades)
+            new_ballot = tuple(new_ballot)
+            self.count.replace_ballot(ballots[index], new_ballot)
+            ballots[index] = new_ballot
+
+            expected_success, expected = self.full_count(ballots)
+            actual_success, actual = self.count.standings()
+            self.assertEqual(expected_success, actual_success)
+            self.assertEqual(expected.tie_groups, actual.tie_groups)
+
+    def test_replacing_a_ballot_only_recomputes_the_changed_candidates(self):
+        self.count.add_ballot((1, 1, 2, 3))
+        self.count.add_ballot((0, 4, 2, 1))
+
+        recomputed = []
+        original_sort_key = live_count.sort_key
+        def counting_sort_key(tally):
+            recomputed.append(list(tally))
+            return original_sort_key(tally)
+
+        live_count.sort_key = counting_sort_key
+        try:
+            self.count.replace_ballot((1, 1, 2, 3), (1, 1, 2, 4))
+        finally:
+            live_count.sort_key = original_sort_key
+
+        self.assertEqual([[0, 1, 0, 0, 1]], recomputed)
+        self.assertEqual(self.full_count([(1, 1, 2, 4), (0, 4, 2, 1)]), self.count.standings())
+
+    def test_incomplete_ballot_raises_error(self):
+        with self.assertRaises(IncompleteVoteError):
+            self.count.add_ballot((1, 1, 2))
+
+    def test_invalid_ballot_raises_error_without_counting_it(self):
+        with self.assertRaises(InvalidVoteError):
+            self.count.add_ballot((1, 1, 2, 5))
+        self.assertEqual(0, self.count.number_of_ballots)
+
+    def test_retracting_a_ballot_that_was_never_added_raises_error(self):
+        self.count.add_ballot((1, 1, 2, 3))
+        with self.assertRaises(ValueError):
+            self.count.retract_ballot((1, 1, 2, 4))
+        self.assertEqual(self.full_count([(1, 1, 2, 3)]), self.count.standings())
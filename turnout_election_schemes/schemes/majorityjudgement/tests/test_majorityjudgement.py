@@ -1,3 +1,5 @@
+import json
+from StringIO import StringIO
 import unittest
 from turnout_election_schemes.schemes.majorityjudgement.count import MajorityJudgementCount
 from turnout_election_schemes.schemes.majorityjudgement.scheme import Scheme
@@ -76,6 +78,12 @@ class MajorityJudgementTest(unittest.TestCase):
         with self.assertRaises(IncompleteVoteError):
             MajorityJudgementCount().sort_candidates(input_data)
 
+    def test_different_numbers_of_votes(self):
+        input_data = (('Pizza', (0,0,1)), ('Burger', (5,0,0)))
+
+        with self.assertRaises(IncompleteVoteError):
+            MajorityJudgementCount().sort_candidates(input_data)
+
     def test_even_number_of_voters_different_medians(self):
         """
         In this case, there are 6 voters.
@@ -114,7 +122,6 @@ class MajorityJudgementTest(unittest.TestCase):
         self.assertEqual(actual_output[2], jones)
         self.assertFalse(success)
 
-    @unittest.skip('Not yet implemented')
     def test_two_identical_losers(self):
         castle = ('Castle', (2,2,1))               #PPAAG
         fort = ('Fort', (0,0,5))                   #GGGGG
@@ -123,8 +130,95 @@ class MajorityJudgementTest(unittest.TestCase):
         input_data = (castle, fort, country_house)
         expected_output = (fort, castle, country_house)
 
-        actual_output = MajorityJudgementCount().sort_candidates(input_data)
-        self.fail("TODO: Sort this test and implementation out - we need to do something better when there are two losers")
+        success, actual_output = MajorityJudgementCount().sort_candidates(input_data)
+        self.assertEqual(expected_output, actual_output)
+        self.assertEqual(((fort,), (castle, country_house)), actual_output.tie_groups)
+        self.assertTrue(success)
+
+    def test_tie_groups_at_every_rank(self):
+        a = ('A', (1,2,2))
+        b = ('B', (0,3,2))
+        c = ('C', (2,2,1))
+        d = ('D', (0,3,2))
+        e = ('E', (1,2,2))
+
+        success, actual_output = MajorityJudgementCount().sort_candidates((a, b, c, d, e))
+        self.assertEqual((b, d, a, e, c), actual_output)
+        self.assertEqual(((b, d), (a, e), (c,)), actual_output.tie_groups)
+        self.assertFalse(success)
+
+class ProfileCandidatesTest(unittest.TestCase):
+    def test_profiles_are_in_ranked_order(self):
+        pizza = ('Pizza', (1,1,3))
+        burger = ('Burger', (3,0,2))
+        veggie = ('Veggie', (2,2,1))
+
+        success, ranked, profiles = MajorityJudgementCount().profile_candidates((pizza, burger, veggie))
+
+        self.assertTrue(success)
+        self.assertEqual((pizza, veggie, burger), ranked)
+        self.assertEqual((
+            {'grade': 2, 'order': 0, 'above': 0.0, 'below': 0.4},
+            {'grade': 1, 'order': 1, 'above': 0.2, 'below': 0.4},
+            {'grade': 0, 'order': 2, 'above': 0.4, 'below': 0.0}), profiles)
+
+    def test_median_is_the_lower_median(self):
+        red = ('Red party', (3,0,3))     #PPPGGG
+
+        success, ranked, profiles = MajorityJudgementCount().profile_candidates((red,))
+
+        self.assertEqual(({'grade': 0, 'order': 0, 'above': 0.5, 'below': 0.0},), profiles)
+
+    def test_no_votes(self):
+        success, ranked, profiles = MajorityJudgementCount().profile_candidates((('A', (0, 0)),))
+
+        self.assertEqual(({'grade': 0, 'order': 0, 'above': 0.0, 'below': 0.0},), profiles)
+
+class SelectTopTest(unittest.TestCase):
+    def setUp(self):
+        self.chinese = ('Chinese', (12,40,6,8,7,26))
+        self.pizza = ('Pizza', (2,10,21,4,17,45))
+        self.indian = ('Indian', (10,4,33,33,2,17))
+        self.burger = ('Burger', (6,12,40,26,7,8))
+
+        self.input_data = (self.chinese, self.pizza, self.indian, self.burger)
+
+    def test_select_winner(self):
+        success, actual_output = MajorityJudgementCount().select_top(self.input_data, 1)
+        self.assertEqual((self.pizza,), actual_output)
+        self.assertTrue(success)
+
+    def test_select_top_two(self):
+        success, actual_output = MajorityJudgementCount().select_top(self.input_data, 2)
+        self.assertEqual((self.pizza, self.indian), actual_output)
+        self.assertTrue(success)
+
+    def test_select_more_than_there_are_candidates(self):
+        success, actual_output = MajorityJudgementCount().select_top(self.input_data, 10)
+        self.assertEqual((self.pizza, self.indian, self.burger, self.chinese), actual_output)
+        self.assertTrue(success)
+
+    def test_tie_at_the_boundary(self):
+        smith = ('L. Smith', (2, 7, 5, 8, 3))
+        jones = ('Q. Jones', (0, 9, 2, 3, 11))
+        rogers = ('P. Rogers', (2, 7, 5, 8, 3))
+
+        success, actual_output = MajorityJudgementCount().select_top((smith, jones, rogers), 2)
+        self.assertEqual((jones, smith), actual_output)
+        self.assertFalse(success)
+
+        success, actual_output = MajorityJudgementCount().select_top((smith, jones, rogers), 1)
+        self.assertEqual((jones,), actual_output)
+        self.assertTrue(success)
+
+    def test_two_identical_winners(self):
+        smith = ('L. Smith', (2, 7, 5, 8, 3))
+        jones = ('Q. Jones', (11, 9, 2, 3, 0))
+        rogers = ('P. Rogers', (2, 7, 5, 8, 3))
+
+        success, actual_output = MajorityJudgementCount().select_top((smith, jones, rogers), 1)
+        self.assertEqual((smith,), actual_output)
+        self.assertFalse(success)
 
 class TestMajorityJudgementScheme(unittest.TestCase):
     def test_basic_small_case(self):
@@ -134,14 +228,57 @@ class TestMajorityJudgementScheme(unittest.TestCase):
         votes = [steve, bob, dave]
         candidate_ids = [9, 17, 24, 101]
 
+        third = 1 / 3.0
         expected_output = {
-                9:   {'grade': 1, 'order': 3, 'counts': (0,2,0,1,0)},
-                17:  {'grade': 2, 'order': 1, 'counts': (0,1,2,0,0)},
-                24:  {'grade': 2, 'order': 2, 'counts': (1,0,1,1,0)},
-                101: {'grade': 3, 'order': 0, 'counts': (0,1,0,2,0)}}
+                9:   {'grade': 1, 'order': 3, 'above': third, 'below': 0.0,   'counts': (0,2,0,1,0)},
+                17:  {'grade': 2, 'order': 1, 'above': 0.0,   'below': third, 'counts': (0,1,2,0,0)},
+                24:  {'grade': 2, 'order': 2, 'above': third, 'below': third, 'counts': (1,0,1,1,0)},
+                101: {'grade': 3, 'order': 0, 'above': 0.0,   'below': third, 'counts': (0,1,0,2,0)}}
 
         scheme = Scheme()
         success, result, winners = scheme.perform_count(candidate_ids, [steve, bob, dave], 4)
 
         self.assertTrue(success)
         self.assertEqual(expected_output, result)
+
+    def test_count_from_tallies(self):
+        tallies = {
+                9:   (0,2,0,1),
+                17:  (0,1,2),
+                24:  (1,0,1,1,0),
+                101: (0,1,0,2,0)}
+
+        third = 1 / 3.0
+        expected_output = {
+                9:   {'grade': 1, 'order': 3, 'above': third, 'below': 0.0,   'counts': (0,2,0,1,0)},
+                17:  {'grade': 2, 'order': 1, 'above': 0.0,   'below': third, 'counts': (0,1,2,0,0)},
+                24:  {'grade': 2, 'order': 2, 'above': third, 'below': third, 'counts': (1,0,1,1,0)},
+                101: {'grade': 3, 'order': 0, 'above': 0.0,   'below': third, 'counts': (0,1,0,2,0)}}
+
+        success, result, winners = Scheme().perform_count_from_tallies(tallies)
+
+        self.assertTrue(success)
+        self.assertEqual(expected_output, result)
+        self.assertEqual((101,), winners)
+
+    def test_count_from_tallies_with_different_numbers_of_votes(self):
+        with self.assertRaises(IncompleteVoteError):
+            Scheme().perform_count_from_tallies({'a': (0,0,1), 'b': (5,0,0)})
+
+    def test_count_from_tallies_gives_same_result_as_votes(self):
+        votes = [(1,2,3,3), (3,2,2,1), (1,1,0,3), (0,4,4,2), (2,2,1,0)]
+        candidate_ids = ['a', 'b', 'c', 'd']
+
+        aggregated_votes = VoteAggregator(candidate_ids, 5).aggregate(votes)
+
+        self.assertEqual(
+            Scheme().perform_count(candidate_ids, votes, 4),
+            Scheme().perform_count_from_tallies(aggregated_votes))
+
+    def test_count_from_json_stream_gives_same_result_as_votes(self):
+        votes = [(1,2,3,3), (3,2,2,1), (1,1,0,3), (0,4,4,2), (2,2,1,0)]
+        candidate_ids = ['a', 'b', 'c', 'd']
+
+        self.assertEqual(
+            Scheme().perform_count(candidate_ids, votes, 4),
+            Scheme().perform_count_from_json_stream(candidate_ids, StringIO(json.dumps(votes)), 4))
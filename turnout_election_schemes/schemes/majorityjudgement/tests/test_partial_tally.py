@@ -0,0 +1,70 @@
+import random
+import unittest
+from turnout_election_schemes.schemes.majorityjudgement.count import MajorityJudgementCount
+from turnout_election_schemes.schemes.majorityjudgement.partial_tally import PartialTally
+from turnout_election_schemes.schemes.majorityjudgement.vote_aggregator import VoteAggregator
+
+class TestPartialTally(unittest.TestCase):
+    def setUp(self):
+        self.candidates = ('Pizza', 'Chinese', 'Indian', 'Burger')
+        self.number_of_grades = 5
+
+        generator = random.Random(12)
+        self.votes = [
+            tuple(generator.randrange(self.number_of_grades) for _ in self.candidates)
+                for _ in range(200)]
+
+    def shards(self, *boundaries):
+        boundaries = (0,) + boundaries + (len(self.votes),)
+        return [
+            PartialTally.from_votes(self.candidates, self.number_of_grades, self.votes[start:end])
+                for start, end in zip(boundaries, boundaries[1:])]
+
+    def test_merged_shards_equal_aggregating_all_votes(self):
+        expected = VoteAggregator(self.candidates, self.number_of_grades).aggregate(self.votes)
+
+        merged = reduce(PartialTally.merge, self.shards(10, 70, 150))
+
+        self.assertEqual(expected, merged.aggregate())
+        self.assertEqual(
+            MajorityJudgementCount().sort_candidates(expected),
+            MajorityJudgementCount().sort_candidates(merged.aggregate()))
+
+    def test_merge_is_commutative_and_associative(self):
+        a, b, c = self.shards(50, 120)
+
+        self.assertEqual(a.merge(b), b.merge(a))
+        self.assertEqual(a.merge(b).merge(c), a.merge(b.merge(c)))
+
+    def test_merge_pads_missing_grades(self):
+        a = PartialTally(('A', 'B'), ((1, 2), (3, 0)))
+        b = PartialTally(('A', 'B'), ((0, 0, 1), (1, 1, 1)))
+
+        self.assertEqual(PartialTally(('A', 'B'), ((1, 2, 1), (4, 1, 1))), a.merge(b))
+
+    def test_cannot_merge_different_candidates(self):
+        a = PartialTally(('A', 'B'), ((1, 2), (3, 0)))
+        b = PartialTally(('B', 'A'), ((1, 2), (3, 0)))
+
+        with self.assertRaises(ValueError):
+            a.merge(b)
+
+    def test_serialization_round_trip(self):
+        for tally in self.shards(50) + [PartialTally((), ()), PartialTally((u'Caf\xe9', 7), ((0,), (2 ** 40,)))]:
+            self.assertEqual(tally, PartialTally.from_bytes(tally.to_bytes()))
+
+    def test_serialization_is_compact(self):
+        tally, = self.shards()
+        self.assertLess(len(tally.to_bytes()), 250)
+
+    def test_from_bytes_rejects_other_data(self):
+        with self.assertRaises(ValueError):
+            PartialTally.from_bytes('not a tally at all')
+
+    def test_from_bytes_rejects_short_data(self):
+        tally, = self.shards()
+        data = tally.to_bytes()
+
+        for length in (0, 3, PartialTally.HEADER.size - 1, PartialTally.HEADER.size, len(data) - 1):
+            with self.assertRaises(ValueError):
+                PartialTally.from_bytes(data[:length])
@@ -0,0 +1,124 @@
+import random
+import unittest
+from turnout_election_schemes.schemes.majorityjudgement.count import MajorityJudgementCount
+from turnout_election_schemes.schemes.majorityjudgement.projection import Projector
+from turnout_election_schemes.schemes.majorityjudgement.vote_aggregator import VoteAggregator
+from turnout_election_schemes.schemes.errors import IncompleteVoteError
+
+class TestProjector(unittest.TestCase):
+    def setUp(self):
+        self.candidates = ('Pizza', 'Chinese', 'Indian')
+        self.number_of_grades = 5
+        self.projector = Projector(self.candidates, self.number_of_grades, checkpoint=100)
+
+    def ballots(self, seed, count, favourite_grades):
+        generator = random.Random(seed)
+        return [
+            tuple(generator.choice(grades) for grades in favourite_grades)
+                for _ in range(count)]
+
+    def full_count(self, ballots):
+        aggregator = VoteAggregator(self.candidates, self.number_of_grades)
+        return MajorityJudgementCount().sort_candidates(aggregator.aggregate(ballots))
+
+    def test_clear_winner_stops_early(self):
+        ballots = self.ballots(1, 10000, [(3, 4), (0, 1, 2), (0, 1)])
+
+        projection = self.projector.project_stream(iter(ballots))
+
+        self.assertFalse(projection.exact)
+        self.assertEqual(100, projection.ballots_counted)
+        self.assertEqual('Pizza', projection.winner())
+        self.assertEqual(self.full_count(ballots)[1][0][0], projection.winner())
+
+    def test_bounds_contain_the_full_count_median(self):
+        ballots = self.ballots(2, 10000, [(3, 4), (0, 1, 2), (0, 1)])
+
+        projection = self.projector.project_stream(iter(ballots))
+
+        for name, counts in self.full_count(ballots)[1]:
+            lowest, highest = projection.bounds[name]
+            running_total, full_median = 0, None
+            for grade, count in enumerate(counts):
+                running_total += count
+                if full_median is None and running_total > (sum(counts) - 1) // 2:
+                    full_median = grade
+            self.assertTrue(lowest <= full_median <= highest)
+
+    def test_close_race_falls_back_to_the_full_count(self):
+        ballots = self.ballots(3, 1000, [(1, 2, 3), (1, 2, 3), (0,)])
+
+        projection = self.projector.project_stream(iter(ballots))
+
+        self.assertTrue(projection.exact)
+        self.assertEqual(1000, projection.ballots_counted)
+        self.assertEqual(self.full_count(ballots), (projection.succeeded, projection.ranked))
+        for name, (lowest, highest) in projection.bounds.items():
+            self.assertEqual(lowest, highest)
+
+    def test_no_ballots(self):
+        projection = self.projector.project_stream(iter([]))
+
+        self.assertTrue(projection.exact)
+        self.assertEqual(0, projection.ballots_counted)
+
+    def test_sample_with_clear_winner(self):
+        ballots = self.ballots(4, 10000, [(0, 1), (3, 4), (0, 1, 2)])
+
+        projection = self.projector.project_sample(ballots, 500, random.Random(4))
+
+        self.assertFalse(projection.exact)
+        self.assertEqual(500, projection.ballots_counted)
+        self.assertEqual('Chinese', projection.winner())
+
+    def test_sample_of_close_race_falls_back_to_the_full_count(self):
+        ballots = self.ballots(5, 1000, [(1, 2, 3), (1, 2, 3), (0,)])
+
+        projection = self.projector.project_sample(ballots, 100, random.Random(5))
+
+        self.assertTrue(projection.exact)
+        self.assertEqual(self.full_count(ballots), (projection.succeeded, projection.ranked))
+
+    def test_sample_larger_than_the_ballots_counts_them_all(self):
+        ballots = self.ballots(6, 50, [(3, 4), (0,), (0,)])
+
+        projection = self.projector.project_sample(ballots, 100)
+
+        self.assertTrue(projection.exact)
+        self.assertEqual(50, projection.ballots_counted)
+
+    def test_higher_confidence_needs_more_ballots(self):
+        ballots = self.ballots(7, 10000, [(2, 3, 4), (1, 2, 3), (0, 1)])
+
+        relaxed = Projector(self.candidates, self.number_of_grades, confidence=0.8, checkpoint=10)
+        strict = Projector(self.candidates, self.number_of_grades, confidence=0.9999, checkpoint=10)
+
+        self.assertTrue(
+            relaxed.project_stream(iter(ballots)).ballots_counted <=
+            strict.project_stream(iter(ballots)).ballots_counted)
+
+    def test_frequent_checks_keep_the_confidence(self):
+        """
+        Checking a close race every few ballots gives many chances to stop on
+        the wrong winner, which must still happen no more often than the
+        confidence allows.
+        """
+        projector = Projector(('Pizza', 'Burger'), 2, confidence=0.9, checkpoint=5)
+        ballots = [(1, 0)] * 202 + [(0, 1)] * 198
+        runs = 150
+
+        wrong_winners = 0
+        for seed in range(runs):
+            random.Random(seed).shuffle(ballots)
+            if projector.project_stream(iter(ballots)).winner() != 'Pizza':
+                wrong_winners += 1
+
+        self.assertTrue(wrong_winners <= (1 - 0.9) * runs)
+
+    def test_too_few_ballots_do_not_bound_the_median(self):
+        self.assertEqual((0, 4), self.projector.median_bounds((0, 0, 5, 0, 0)))
+        self.assertEqual((2, 2), self.projector.median_bounds((0, 0, 50, 0, 0)))
+
+    def test_incomplete_ballot_raises_error(self):
+        with self.assertRaises(IncompleteVoteError):
+            self.projector.project_stream(iter([(1, 2, 3), (1, 2)]))
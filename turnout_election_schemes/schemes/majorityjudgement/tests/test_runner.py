@@ -0,0 +1,184 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from StringIO import StringIO
+from turnout_election_schemes.schemes.errors import IncompleteVoteError
+from turnout_election_schemes.schemes.majorityjudgement.count import MajorityJudgementCount
+from turnout_election_schemes.schemes.majorityjudgement.runner import Runner
+from turnout_election_schemes.schemes.majorityjudgement.vote_aggregator import VoteAggregator
+
+class RunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.candidates = ['Pizza', 'Chinese', 'Indian', 'Burger']
+
+        generator = random.Random(21)
+        self.votes = [
+            [generator.randrange(6) for _ in self.candidates]
+                for _ in range(500)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_csv(self, name, votes):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as f:
+            f.write('voter,%s\r\n' % ','.join(self.candidates))
+            for i, vote in enumerate(votes):
+                f.write('%d,%s\r\n' % (i, ','.join(str(grade) if grade else '' for grade in vote)))
+        return path
+
+    def expected_report(self, votes):
+        aggregated_votes = VoteAggregator(self.candidates, 6).aggregate(votes)
+        return MajorityJudgementCount().sort_candidates(aggregated_votes)[1]
+
+    def test_run_reads_a_stream(self):
+        path = self.write_csv('votes.csv', self.votes)
+
+        with open(path, 'rb') as f:
+            results = Runner().run(f)
+
+        expected = self.expected_report(self.votes)
+        self.assertEqual(expected, results.report)
+        self.assertEqual([expected[0][0]], results.outcome)
+
+    def test_run_grows_the_grades_to_fit_the_votes(self):
+        stream = StringIO(
+            'voter,Pizza,Burger\r\n'
+            '1,1,\r\n'
+            '2,,1\r\n'
+            '3,3,2\r\n')
+
+        results = Runner().run(stream)
+
+        self.assertEqual((('Pizza', (1, 1, 0, 1)), ('Burger', (1, 1, 1, 0))), results.report)
+        self.assertEqual(['Pizza'], results.outcome)
+
+    def test_run_with_a_tie_reports_every_winner(self):
+        stream = StringIO('voter,Pizza,Burger\r\n1,1,1\r\n2,2,2\r\n')
+
+        results = Runner().run(stream)
+
+        self.assertEqual(['Pizza', 'Burger'], results.outcome)
+
+    def test_run_with_incomplete_row_raises_error(self):
+        stream = StringIO('voter,Pizza,Burger\r\n1,1,1\r\n2,1\r\n')
+
+        with self.assertRaises(IncompleteVoteError):
+            Runner().run(stream)
+
+    def test_run_tallies(self):
+        stream = StringIO(
+            'candidate,0,1,2,3\r\n'
+            'Pizza,1,1,0,1\r\n'
+            'Burger,1,1,1\r\n')
+
+        results = Runner().run_tallies(stream)
+
+        self.assertEqual((('Pizza', (1, 1, 0, 1)), ('Burger', (1, 1, 1, 0))), results.report)
+        self.assertEqual(['Pizza'], results.outcome)
+
+    def test_run_tallies_with_different_numbers_of_votes_raises_error(self):
+        stream = StringIO(
+            'candidate,0,1,2\r\n'
+            'Pizza,0,0,1\r\n'
+            'Burger,5\r\n')
+
+        with self.assertRaises(IncompleteVoteError):
+            Runner().run_tallies(stream)
+
+    def test_run_tallies_without_a_header_raises_error(self):
+        stream = StringIO(
+            'Pizza,1,1,0,1\r\n'
+            'Burger,1,1,1\r\n')
+
+        with self.assertRaises(ValueError):
+            Runner().run_tallies(stream)
+
+    def test_run_files_with_one_process(self):
+        path = self.write_csv('votes.csv', self.votes)
+
+        results = Runner().run_files([path], processes=1)
+
+        expected = self.expected_report(self.votes)
+        self.assertEqual(expected, results.report)
+        self.assertEqual([expected[0][0]], results.outcome)
+
+    def test_run_files_splits_a_file_between_processes(self):
+        path = self.write_csv('votes.csv', self.votes)
+
+        results = Runner().run_files([path], processes=7)
+
+        self.assertEqual(self.expected_report(self.votes), results.report)
+
+    def test_run_files_with_shards(self):
+        paths = [
+            self.write_csv('shard1.csv', self.votes[:100]),
+            self.write_csv('shard2.csv', self.votes[100:101]),
+            self.write_csv('shard3.csv', []),
+            self.write_csv('shard4.csv', self.votes[101:]),
+        ]
+
+        results = Runner().run_files(paths, processes=3)
+
+        self.assertEqual(self.expected_report(self.votes), results.report)
+
+    def test_run_files_reports_where_an_incomplete_row_is(self):
+        votes = list(self.votes)
+        votes[300] = votes[300][:2]
+        path = self.write_csv('votes.csv', votes)
+
+        with self.assertRaises(IncompleteVoteError) as context:
+            Runner().run_files([path], processes=3)
+
+        message = str(context.exception)
+        self.assertIn(" of those starting in bytes ", message)
+        self.assertIn(path, message)
+
+    def test_run_files_with_different_candidates_raises_error(self):
+        first = self.write_csv('shard1.csv', self.votes[:100])
+        self.candidates.reverse()
+        second = self.write_csv('shard2.csv', self.votes[100:])
+
+        with self.assertRaises(ValueError):
+            Runner().run_files([first, second], processes=1)
+
+    def test_run_contests_matches_running_each_contest(self):
+        stream = StringIO(
+            'voter,Pizza,Burger,Alice,Bob,Carol\r\n'
+            '1,1,,4,2,\r\n'
+            '2,,1,3,3,1\r\n'
+            '3,2,2,4,1,\r\n')
+        contests = {'Lunch': ['Burger', 'Pizza'], 'Chair': ['Alice', 'Bob', 'Carol']}
+
+        results = Runner().run_contests(stream, contests)
+
+        lunch = Runner().run(StringIO('voter,Burger,Pizza\r\n1,,1\r\n2,1,\r\n3,2,2\r\n'))
+        chair = Runner().run(StringIO('voter,Alice,Bob,Carol\r\n1,4,2,\r\n2,3,3,1\r\n3,4,1,\r\n'))
+        self.assertEqual(['Chair', 'Lunch'], sorted(results))
+        self.assertEqual(lunch.report, results['Lunch'].report)
+        self.assertEqual(lunch.outcome, results['Lunch'].outcome)
+        self.assertEqual(chair.report, results['Chair'].report)
+        self.assertEqual(['Alice'], results['Chair'].outcome)
+
+    def test_run_contests_in_processes(self):
+        path = self.write_csv('votes.csv', self.votes)
+        contests = {'first': self.candidates[:2], 'second': self.candidates[2:]}
+
+        with open(path, 'rb') as f:
+            results = Runner().run_contests(f, contests, processes=2)
+
+        for contest, candidates in contests.items():
+            aggregated_votes = VoteAggregator(candidates, 6).aggregate(
+                [vote[self.candidates.index(c)] for c in candidates] for vote in self.votes)
+            expected = MajorityJudgementCount().sort_candidates(aggregated_votes)[1]
+            self.assertEqual(expected, results[contest].report)
+            self.assertEqual(expected.tie_groups, results[contest].report.tie_groups)
+
+    def test_run_contests_with_unknown_column_raises_error(self):
+        stream = StringIO('voter,Pizza,Burger\r\n1,1,1\r\n')
+
+        with self.assertRaises(ValueError):
+            Runner().run_contests(stream, {'Lunch': ['Pizza', 'Chips']})
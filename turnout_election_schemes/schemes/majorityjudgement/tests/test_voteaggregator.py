@@ -106,3 +106,44 @@ class TestVoteAggregator(unittest.TestCase):
         # Act/assert
         with self.assertRaises(InvalidVoteError):
             self.aggregator.aggregate(all_votes)
+
+    def test_votes_can_be_a_generator(self):
+        # Arrange
+        all_votes = ((i % 5, 4 - i % 5, 2, 0) for i in range(10))
+
+        # Act
+        actual_output = self.aggregator.aggregate(all_votes)
+
+        # Assert
+        expected_output = (
+                ('Pizza',   (2, 2, 2, 2, 2)),
+                ('Chinese', (2, 2, 2, 2, 2)),
+                ('Indian',  (0, 0, 10, 0, 0)),
+                ('Burger',  (10, 0, 0, 0, 0)))
+
+        self.assertEqual(expected_output, actual_output)
+
+    def test_errors_give_the_index_of_the_offending_ballot(self):
+        # Arrange
+        all_votes = ((2, 1, 2, 3), (1, 3, 3, 1), (1, 1, 2, 7))
+
+        # Act/assert
+        with self.assertRaisesRegexp(InvalidVoteError, 'Ballot 2'):
+            self.aggregator.aggregate(all_votes)
+
+        with self.assertRaisesRegexp(IncompleteVoteError, 'Ballot 1'):
+            self.aggregator.aggregate(((2, 1, 2, 3), (1, 3)))
+
+    def test_counting_votes_one_at_a_time(self):
+        all_votes = ((2, 1, 2, 3), (1, 3, 3, 1))
+
+        grade_counts = self.aggregator.empty_grade_counts()
+        for vote in all_votes:
+            self.aggregator.count_vote(grade_counts, vote)
+
+        self.assertEqual(
+            self.aggregator.aggregate(all_votes),
+            tuple(zip(self.aggregator.candidate_names, map(tuple, grade_counts))))
+
+        with self.assertRaisesRegexp(InvalidVoteError, 'Ballot 5'):
+            self.aggregator.count_vote(grade_counts, (1, 1, 2, 7), 5)
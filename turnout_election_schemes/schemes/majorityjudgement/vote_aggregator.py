@@ -1,4 +1,3 @@
-from operator import itemgetter
 from turnout_election_schemes.schemes.errors import IncompleteVoteError, InvalidVoteError
 
 class VoteAggregator(object):
@@ -7,43 +6,50 @@ class VoteAggregator(object):
         self.number_of_grades = number_of_grades
 
     def aggregate(self, votes):
-        votes_for_candidates = self._transpose_votes(votes)
-
-        return tuple(
-            self._candidate_tuple(candidate_name, candidate_votes)
-                for candidate_name, candidate_votes
-                in zip(self.candidate_names, votes_for_candidates))
-
-    def _transpose_votes(self, votes):
-        """
-        Takes a set of user votes as input (which is a list of lists - each inner
-        list is a specific user's votes, expressed as a numeric preference for
-        each candidate. e.g. (1,0,2) means the user gave score 1 to the first
-        candidate, score 0 to the second, and score 2 to the third).
-
-        It returns a set of scores for each candidate (i.e. a list of lists,
-        with each inner list being a set of scores given to that candidate).
         """
-        try:
-            return tuple(map(itemgetter(i), votes) for i, _ in enumerate(self.candidate_names))
-        except IndexError:
-            raise IncompleteVoteError()
-
-    def _grade_counts_for_candidate(self, candidate_votes):
-        """
-        Calculates the number of votes at each grade level a candidate received.
-        E.g. if the candidate received 5 "1"s, 3 "3"s and 2 "0"s, and the
-        maximum score is 4, it would return (2, 5, 0, 3, 0)
+        Takes the user votes as input (any iterable of them, including a
+        generator, which is only read once). Each vote is a list of numeric
+        grades, one for each candidate, e.g. (1,0,2) means the user gave
+        grade 1 to the first candidate, 0 to the second and 2 to the third.
+
+        Returns a tuple of (candidate name, grade counts) for each candidate,
+        where the grade counts are the number of votes at each grade level the
+        candidate received. E.g. if the candidate received 5 "1"s, 3 "3"s and
+        2 "0"s, and the maximum grade is 4, it would be (2, 5, 0, 3, 0).
+
+        Only the grade counts are kept while reading the votes, so memory use
+        does not depend on the number of voters.
         """
-        grade_counts = [0] * self.number_of_grades
+        grade_counts = self.empty_grade_counts()
 
-        for vote in candidate_votes:
-            if vote < 0 or vote > self.number_of_grades - 1:
-                raise InvalidVoteError()
+        for ballot_index, vote in enumerate(votes):
+            self.count_vote(grade_counts, vote, ballot_index)
 
-            grade_counts[vote] += 1
+        return tuple(
+            (candidate_name, tuple(candidate_grade_counts))
+                for candidate_name, candidate_grade_counts
+                in zip(self.candidate_names, grade_counts))
 
-        return tuple(grade_counts)
+    def empty_grade_counts(self):
+        return [[0] * self.number_of_grades for _ in self.candidate_names]
 
-    def _candidate_tuple(self, candidate_name, candidate_votes):
-        return (candidate_name, self._grade_counts_for_candidate(candidate_votes))
+    def count_vote(self, grade_counts, vote, ballot_index=0):
+        """
+        Check a single vote and add it to grade_counts, as returned by
+        empty_grade_counts, for callers which need the counts as they go
+        rather than only at the end. ballot_index is used in error messages.
+        """
+        if len(vote) < len(grade_counts):
+            raise IncompleteVoteError(
+                "Ballot %d has %d grades for %d candidates" % (ballot_index, len(vote), len(grade_counts)))
+
+        for grade, candidate_grade_counts in zip(vote, grade_counts):
+            if grade < 0 or grade > self.number_of_grades - 1:
+                raise InvalidVoteError(
+                    "Ballot %d has grade %s, which is not between 0 and %d" % (ballot_index, grade, self.number_of_grades - 1))
+
+            try:
+                candidate_grade_counts[grade] += 1
+            except TypeError:
+                raise InvalidVoteError(
+                    "Ballot %d has grade %r, which is not a whole number" % (ballot_index, grade))
@@ -0,0 +1,151 @@
+from array import array
+
+class BallotStore(object):
+    def __init__(self, candidate_indices):
+        """
+        Holds the ballots of a count in a few flat arrays rather than as an
+        object each, and refers to each ballot by its index.
+
+        candidate_indices maps the id of each candidate running to a small
+        integer index. Every ballot's preferences for candidates who are
+        running are stored as those indices, one ballot after another, in a
+        single array, and offsets holds where each ballot's preferences start
+        and end. Alongside are the number of identical ballots each one
+        stands for, the position in preferences of the preference it
+        currently counts for, the position of its first preference for a
+        candidate who has not been excluded, which is where it starts each
+        round, and its value.
+
+        The values are exact, so they are kept in a list rather than an
+        array: they are 1 until a surplus is transferred, and the ballots
+        devalued together share the same Fraction.
+        """
+        self.candidate_indices = candidate_indices
+        self.preferences = array('i')
+        self.offsets = array('l', [0])
+        self.multiplicities = array('l')
+        self.positions = array('l')
+        self.first_positions = array('l')
+        self.values = []
+
+    def __len__(self):
+        return len(self.multiplicities)
+
+    def add(self, candidate_preferences, multiplicity=1):
+        """
+        Add multiplicity identical ballots with the given preferences, and
+        return the index of the ballot standing for them.
+        """
+        self.positions.append(len(self.preferences))
+        self.first_positions.append(len(self.preferences))
+        candidate_indices = self.candidate_indices
+        self.preferences.fromlist([
+            candidate_indices[candidate]
+                for candidate in candidate_preferences
+                if candidate in candidate_indices
+        ])
+        self.offsets.append(len(self.preferences))
+        self.multiplicities.append(multiplicity)
+        self.values.append(1)
+        return len(self.multiplicities) - 1
+
+    def copy(self):
+        """
+        A copy of the store whose positions and values can change without
+        changing these. The preferences are shared, so no more ballots may be
+        added to either.
+        """
+        store = BallotStore.__new__(BallotStore)
+        store.candidate_indices = self.candidate_indices
+        store.preferences = self.preferences
+        store.offsets = self.offsets
+        store.multiplicities = self.multiplicities
+        store.positions = array('l', self.positions)
+        store.first_positions = array('l', self.first_positions)
+        store.values = list(self.values)
+        return store
+
+    def candidate_preferences(self, ballot):
+        return self.preferences[self.offsets[ballot]:self.offsets[ballot + 1]]
+
+    def is_exhausted(self, ballot):
+        """
+        Returns true if this ballot has no preferred candidates left.
+        """
+
+        return self.positions[ballot] >= self.offsets[ballot + 1]
+
+    def number_of_unexhausted_ballots(self):
+        return sum(
+            multiplicity
+                for ballot, multiplicity in enumerate(self.multiplicities)
+                if not self.is_exhausted(ballot)
+        )
+
+    def value_of(self, ballot):
+        """
+        The value of all of the identical ballots this ballot stands for.
+        """
+
+        return self.values[ballot] * self.multiplicities[ballot]
+
+    def preference_from(self, ballot, continuing):
+        """
+        Returns the index of the ballot's most preferred candidate who is
+        continuing, or None if there isn't one. continuing is indexed by
+        candidate index and is true for those who are continuing.
+
+        The ballot's position is moved past any preferences which are not
+        continuing, so candidates must never start continuing again once they
+        have stopped. That way each preference is only looked at once over a
+        whole count.
+        """
+
+        return self._advance(self.positions, ballot, continuing)
+
+    def first_preference_from(self, ballot, running):
+        """
+        The same as preference_from for the candidates who have not been
+        excluded, but moves the position the ballot starts each round from,
+        and moves the ballot there.
+        """
+
+        preference = self._advance(self.first_positions, ballot, running)
+        self.positions[ballot] = self.first_positions[ballot]
+        return preference
+
+    def restore(self, ballots):
+        """
+        Move each of the ballots back to where it starts the round, with its
+        full value.
+        """
+
+        for ballot in ballots:
+            self.positions[ballot] = self.first_positions[ballot]
+            self.values[ballot] = 1
+
+    def _advance(self, positions, ballot, continuing):
+        preferences = self.preferences
+        position = positions[ballot]
+        end = self.offsets[ballot + 1]
+        while position < end and not continuing[preferences[position]]:
+            position += 1
+        positions[ballot] = position
+
+        if position < end:
+            return preferences[position]
+        else:
+            return None
+
+    def devalue(self, ballots, ratio):
+        """
+        Multiply the value of each of the ballots by ratio.
+        """
+
+        values = self.values
+        devalued = {}
+        for ballot in ballots:
+            value = values[ballot]
+            if value not in devalued:
+                devalued[value] = value * ratio
+            values[ballot] = devalued[value]
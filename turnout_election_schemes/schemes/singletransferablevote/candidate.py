@@ -1,11 +1,30 @@
+from array import array
 from fractions import Fraction
 
 class Candidate(object):
-    def __init__(self, candidate_id):
+    def __init__(self, candidate_id, ballots, votes=(), total_value=0):
+        """
+        ballots is the BallotStore holding the ballots of the count, and the
+        candidate's votes are the indices of ballots in it. The candidate may
+        start with some votes already, whose total value is total_value.
+        """
         self.candidate_id = candidate_id
-        self.votes = []
+        self.ballots = ballots
+        self.votes = array('l')
+        self.votes.extend(votes)
         self.elected = False
         self.elected_quota = 0
+        self._total_value = total_value
+
+    def add_vote(self, vote):
+        """
+        Allocate a vote to this candidate. Votes must be added through this
+        method, and only devalued through devalue_votes(), so that the running
+        total of their value is kept up to date.
+        """
+
+        self.votes.append(vote)
+        self._total_value += self.ballots.value_of(vote)
 
     def value_of_votes(self):
         """
@@ -17,7 +36,7 @@ class Candidate(object):
         if self.elected:
             return self.elected_quota
         else:
-            return reduce(lambda a, b: a + b, map(lambda v: v.value, self.votes), 0)
+            return self._total_value
 
     def devalue_votes(self, quota):
         """
@@ -29,8 +48,8 @@ class Candidate(object):
 
         total_value = self.value_of_votes()
         surplus_ratio = Fraction(total_value - quota, total_value)
-        for vote in self.votes:
-            vote.value *= surplus_ratio
+        self.ballots.devalue(self.votes, surplus_ratio)
+        self._total_value = total_value - quota
 
         self.elected = True
         self.elected_quota = quota
@@ -1,7 +1,6 @@
 from turnout_election_schemes.schemes.errors import FailedElectionError
 from .candidate import Candidate
-from .stv_round import Round, _Random
-from .vote import Vote
+from .stv_round import Round, _Random, count_ballots
 
 class SingleTransferableVoteScheme(object):
     def __init__(self, num_vacancies, candidates, votes, random=_Random()):
@@ -9,12 +8,16 @@ class SingleTransferableVoteScheme(object):
         self.original_candidates = candidates
         self.remaining_candidates = candidates
         self.votes = votes
+        self.ballot_counts = count_ballots(votes)
         self.random = random
         self.rounds = []
         self.success = False
 
     def run_round(self):
-        new_round = Round(self.num_vacancies, self.remaining_candidates, self.votes, random=self.random)
+        if self.rounds:
+            new_round = self.latest_round().next_round()
+        else:
+            new_round = Round(self.num_vacancies, self.remaining_candidates, self.ballot_counts, random=self.random)
         new_round.run()
 
         self.remaining_candidates = filter(
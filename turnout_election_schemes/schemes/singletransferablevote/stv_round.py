@@ -1,17 +1,67 @@
+from array import array
 from turnout_election_schemes.schemes.errors import FailedElectionError
+from .ballot_store import BallotStore
 from .candidate import Candidate
-from .vote import Vote
 
 class _Random(object):
     def choice(self, sequence):
         raise FailedElectionError()
 
+def count_ballots(votes):
+    """
+    Returns a dict mapping each distinct ballot, as a tuple of preferences,
+    to the number of times it appears in votes.
+    """
+    ballot_counts = {}
+    for vote in votes:
+        vote = tuple(vote)
+        ballot_counts[vote] = ballot_counts.get(vote, 0) + 1
+    return ballot_counts
+
 class Round(object):
     def __init__(self, num_vacancies, candidates, votes, random=_Random()):
         self.num_vacancies = num_vacancies
         self.random = random
         self._prepare_candidates(candidates)
         self._prepare_votes(votes)
+        self._start()
+
+    def next_round(self):
+        """
+        Returns the next round of the count. Rather than counting every
+        ballot again, it starts from a copy of the piles this round started
+        from, with only the ballots of the candidates excluded in this round
+        moved on to their next preferences and those transferred from
+        surpluses moved back. The next round has its own copy of everything it
+        changes, so this round and its results are left as they are.
+        """
+        next_round = Round.__new__(Round)
+        next_round.num_vacancies = self.num_vacancies
+        next_round.random = self.random
+        next_round._candidate_ids = self._candidate_ids
+        next_round._candidate_indices = self._candidate_indices
+        next_round.ballots = self.ballots.copy()
+        next_round._is_running = bytearray(self._is_running)
+        next_round._piles = [array('l', pile) for pile in self._piles]
+        next_round._pile_totals = list(self._pile_totals)
+        next_round._unexhausted_ballots = self._unexhausted_ballots
+
+        for votes in self._transferred_votes:
+            next_round.ballots.restore(votes)
+
+        excluded_piles = []
+        for candidate in self._excluded_candidates:
+            index = self._candidate_indices[candidate.candidate_id]
+            next_round._is_running[index] = 0
+            excluded_piles.append(next_round._piles[index])
+            next_round._piles[index] = array('l')
+            next_round._pile_totals[index] = 0
+
+        for pile in excluded_piles:
+            next_round._add_to_piles(pile)
+
+        next_round._start()
+        return next_round
 
     def run(self):
         self._provisionally_elect_candidates()
@@ -35,23 +85,66 @@ class Round(object):
         return self._remaining_vacancies() == 0
 
     def _prepare_candidates(self, candidates):
-        self._continuing_candidates = {candidate: Candidate(candidate) for candidate in candidates}
-        self._provisionally_elected_candidates = []
-        self._excluded_candidates = []
+        self._candidate_ids = list(candidates)
+        self._candidate_indices = {candidate: index for index, candidate in enumerate(candidates)}
+        self.ballots = BallotStore(self._candidate_indices)
+        self._is_running = bytearray([1]) * len(self._candidate_ids)
+        self._piles = [array('l') for _ in self._candidate_ids]
+        self._pile_totals = [0] * len(self._candidate_ids)
 
     def _prepare_votes(self, votes):
-        self.votes = map(lambda v: Vote(self._continuing_candidates.keys(), v), votes)
-        self.exhausted_votes = filter(lambda v: v.is_exhausted(), self.votes)
-        self.unexhausted_votes = filter(lambda v: not v.is_exhausted(), self.votes)
+        """
+        Add a single ballot to the store for each distinct ballot, standing
+        for all of the ballots like it, so the count does work for each
+        distinct ranking rather than for each voter. votes may be the ballots
+        or a mapping from each distinct ballot to the number of them, as
+        returned by count_ballots.
+        """
+        if not hasattr(votes, 'items'):
+            votes = count_ballots(votes)
+
+        for preferences, multiplicity in votes.items():
+            self.ballots.add(preferences, multiplicity)
 
-        for vote in self.exhausted_votes:
-            vote.value = 0
+        self._unexhausted_ballots = sum(self.ballots.multiplicities)
+        self._add_to_piles(xrange(len(self.ballots)))
 
+    def _add_to_piles(self, ballots):
+        """
+        Put each ballot on the pile of the candidate it starts the round
+        with, its first preference who is still running.
+        """
+        for ballot in ballots:
+            multiplicity = self.ballots.multiplicities[ballot]
+            preferred_candidate = self.ballots.first_preference_from(ballot, self._is_running)
+            if preferred_candidate is None:
+                self._unexhausted_ballots -= multiplicity
+            else:
+                self._piles[preferred_candidate].append(ballot)
+                self._pile_totals[preferred_candidate] += multiplicity
+
+    def _start(self):
+        """
+        Start the round with each running candidate holding their pile.
+        """
+        self._candidates = [
+            Candidate(candidate, self.ballots, self._piles[index], self._pile_totals[index])
+                if self._is_running[index] else None
+                for index, candidate in enumerate(self._candidate_ids)
+        ]
+        self._is_continuing = bytearray(self._is_running)
+        self._continuing_candidates = {
+            candidate.candidate_id: candidate
+                for candidate in self._candidates
+                if candidate is not None
+        }
+        self._provisionally_elected_candidates = []
+        self._excluded_candidates = []
+        self._transferred_votes = []
         self.quota = self._calculate_quota()
-        self._assign_votes(self.unexhausted_votes)
 
     def _calculate_quota(self):
-        return len(self.unexhausted_votes) / (self.num_vacancies + 1) + 1
+        return self._unexhausted_ballots / (self.num_vacancies + 1) + 1
 
     def _provisionally_elect_candidates(self):
         if len(self._continuing_candidates) <= self._remaining_vacancies():
@@ -70,7 +163,7 @@ class Round(object):
 
         for candidate in candidates_to_elect:
             self._provisionally_elected_candidates.append(candidate)
-            del self._continuing_candidates[candidate.candidate_id]
+            self._stop_continuing(candidate)
 
     def elected_candidates(self):
         """
@@ -91,12 +184,17 @@ class Round(object):
     def _reassign_votes_from_candidate_with_highest_surplus(self):
         candidate = self._candidate_with_highest_surplus()
         candidate.devalue_votes(self.quota)
+        self._transferred_votes.append(candidate.votes)
         self._assign_votes(candidate.votes)
 
     def _exclude_candidates_with_fewest_votes(self):
         for candidate in self._candidates_to_exclude():
             self._excluded_candidates.append(candidate)
-            del self._continuing_candidates[candidate.candidate_id]
+            self._stop_continuing(candidate)
+
+    def _stop_continuing(self, candidate):
+        del self._continuing_candidates[candidate.candidate_id]
+        self._is_continuing[self._candidate_indices[candidate.candidate_id]] = 0
 
     def _candidates_to_exclude(self):
         """
@@ -230,6 +328,6 @@ class Round(object):
 
     def _assign_votes(self, votes):
         for vote in votes:
-            preferred_candidate = vote.preference_from(self._continuing_candidates.keys())
+            preferred_candidate = self.ballots.preference_from(vote, self._is_continuing)
             if preferred_candidate is not None:
-                self._continuing_candidates[preferred_candidate].votes.append(vote)
+                self._candidates[preferred_candidate].add_vote(vote)
@@ -0,0 +1,71 @@
+import unittest
+from fractions import Fraction
+from turnout_election_schemes.schemes.singletransferablevote.ballot_store import BallotStore
+
+class BallotStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.ballots = BallotStore({'A': 0, 'B': 1, 'C': 2, 'D': 3})
+
+    def test_preferences_for_candidates_not_running_are_dropped(self):
+        ballot = self.ballots.add(('C', 'Z', 'A'))
+
+        self.assertEqual([2, 0], list(self.ballots.candidate_preferences(ballot)))
+        self.assertFalse(self.ballots.is_exhausted(ballot))
+
+    def test_ballot_with_no_running_candidates_is_exhausted(self):
+        self.ballots.add(('A',), 2)
+        ballot = self.ballots.add(('Y', 'Z'), 3)
+
+        self.assertTrue(self.ballots.is_exhausted(ballot))
+        self.assertEqual(2, self.ballots.number_of_unexhausted_ballots())
+
+    def test_ballots_are_stored_one_after_another(self):
+        first = self.ballots.add(('A', 'B'))
+        second = self.ballots.add(())
+        third = self.ballots.add(('D', 'C', 'B'))
+
+        self.assertEqual(3, len(self.ballots))
+        self.assertEqual([0, 1, 3, 2, 1], list(self.ballots.preferences))
+        self.assertEqual([], list(self.ballots.candidate_preferences(second)))
+        self.assertEqual([3, 2, 1], list(self.ballots.candidate_preferences(third)))
+
+    def test_preference_from_skips_candidates_who_are_not_continuing(self):
+        self.ballots.add(('B',))
+        ballot = self.ballots.add(('C', 'A', 'D'))
+        continuing = bytearray([1, 1, 1, 1])
+
+        self.assertEqual(2, self.ballots.preference_from(ballot, continuing))
+
+        continuing[2] = 0
+        self.assertEqual(0, self.ballots.preference_from(ballot, continuing))
+
+        continuing[0] = 0
+        continuing[3] = 0
+        self.assertEqual(None, self.ballots.preference_from(ballot, continuing))
+        self.assertTrue(self.ballots.is_exhausted(ballot))
+
+    def test_preference_from_only_looks_at_each_preference_once(self):
+        ballot = self.ballots.add(('A', 'B', 'C', 'D'))
+        continuing = bytearray([0, 0, 1, 1])
+
+        self.assertEqual(2, self.ballots.preference_from(ballot, continuing))
+        self.assertEqual(2, self.ballots.positions[ballot])
+        self.assertEqual(2, self.ballots.preference_from(ballot, continuing))
+        self.assertEqual(2, self.ballots.positions[ballot])
+
+    def test_value_counts_every_identical_ballot(self):
+        ballot = self.ballots.add(('A',), 6)
+
+        self.assertEqual(6, self.ballots.value_of(ballot))
+
+        self.ballots.devalue([ballot], Fraction(1, 4))
+        self.assertEqual(Fraction(3, 2), self.ballots.value_of(ballot))
+
+    def test_ballots_devalued_together_share_their_value(self):
+        first = self.ballots.add(('A',))
+        second = self.ballots.add(('B',))
+
+        self.ballots.devalue([first, second], Fraction(2, 3))
+
+        self.assertEqual(Fraction(2, 3), self.ballots.values[first])
+        self.assertIs(self.ballots.values[first], self.ballots.values[second])
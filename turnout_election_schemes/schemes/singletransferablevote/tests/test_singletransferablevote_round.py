@@ -277,3 +277,63 @@ class RoundTest(unittest.TestCase):
         stv.run()
         self.assertEqual(expected_results, stv.results())
         self.assertTrue(stv.all_vacancies_filled())
+
+    def test_next_round_matches_a_round_of_the_remaining_candidates(self):
+        """
+        The next round carries on from this one, moving the excluded
+        candidate's votes and undoing the surplus transfers, and should give
+        the same results as counting the remaining candidates from scratch.
+        This round's results should stay as they were.
+        """
+
+        vacancies = 2
+        candidates = ('A', 'B', 'C', 'D', 'E')
+        votes = 7 * (('A', 'B', 'C'), ) + \
+                2 * (('B', 'D'), ) + \
+                2 * (('C', 'E', 'B'), ) + \
+                3 * (('D', 'C'), ) + \
+                1 * (('E', 'A', 'D'), )
+
+        first_round = Round(vacancies, candidates, votes)
+        first_round.run()
+        first_results = first_round.results()
+        self.assertEqual({'E': 1}, first_results['excluded'])
+
+        second_round = first_round.next_round()
+
+        fresh_round = Round(vacancies, ('A', 'B', 'C', 'D'), votes)
+        self.assertEqual(fresh_round.quota, second_round.quota)
+        self.assertEqual(fresh_round.results(), second_round.results())
+
+        second_round.run()
+        fresh_round.run()
+        self.assertEqual(fresh_round.results(), second_round.results())
+        self.assertEqual(fresh_round.elected_candidates(), second_round.elected_candidates())
+        self.assertEqual(first_results, first_round.results())
+
+    def test_next_round_leaves_this_round_as_it_was(self):
+        vacancies = 2
+        candidates = ('A', 'B', 'C', 'D', 'E')
+        votes = 7 * (('A', 'B', 'C'), ) + \
+                2 * (('B', 'D'), ) + \
+                2 * (('C', 'E', 'B'), ) + \
+                3 * (('D', 'C'), ) + \
+                1 * (('E', 'A', 'D'), )
+
+        first_round = Round(vacancies, candidates, votes)
+        first_round.run()
+        results = first_round.results()
+        elected = first_round.elected_candidates()
+        positions = list(first_round.ballots.positions)
+        values = list(first_round.ballots.values)
+        piles = [list(pile) for pile in first_round._piles]
+
+        second_round = first_round.next_round()
+        second_round.run()
+        second_round.next_round().run()
+
+        self.assertEqual(results, first_round.results())
+        self.assertEqual(elected, first_round.elected_candidates())
+        self.assertEqual(positions, list(first_round.ballots.positions))
+        self.assertEqual(values, list(first_round.ballots.values))
+        self.assertEqual(piles, [list(pile) for pile in first_round._piles])
@@ -561,3 +561,29 @@ class SingleTransferableVoteUnitTest(unittest.TestCase):
         bulk_exclusions = stv_round._bulk_exclusions()
 
         self.assertTrue(len(bulk_exclusions) == 0)
+
+    def test_identical_ballots_are_counted_as_one_group(self):
+        """
+        Identical ballots are collapsed into a single vote, which still
+        counts for every one of them.
+        """
+
+        votes = 5 * (('A', 'B'), ) + \
+                3 * (('A', 'Z', 'B'), ) + \
+                4 * (('B', ), ) + \
+                2 * (('Z', ), )
+        candidates = ['A', 'B', 'C']
+        vacancies = 1
+
+        stv_round = Round(vacancies, candidates, votes)
+
+        self.assertEqual(4, len(stv_round.ballots))
+        self.assertEqual(12 / 2 + 1, stv_round.quota)
+        self.assertEqual(
+            {'provisionally_elected': {}, 'continuing': {'A': 8, 'B': 4, 'C': 0}, 'excluded': {}},
+            stv_round.results())
+
+        stv_round.run()
+
+        self.assertEqual(['A'], stv_round.elected_candidates())
+        self.assertEqual(8, stv_round.results()['provisionally_elected']['A'])
@@ -0,0 +1,24 @@
+import unittest
+from turnout_election_schemes.schemes.singletransferablevote.vote import Vote
+
+class VoteTest(unittest.TestCase):
+    def setUp(self):
+        self.candidates_running = ('A', 'B', 'C', 'D')
+
+    def test_preferences_for_candidates_not_running_are_dropped(self):
+        vote = Vote(self.candidates_running, ('C', 'Z', 'A'))
+
+        self.assertEqual(['C', 'A'], vote.candidate_preferences)
+        self.assertEqual(1, vote.value)
+        self.assertFalse(vote.is_exhausted())
+
+    def test_vote_with_no_running_candidates_is_exhausted(self):
+        self.assertTrue(Vote(self.candidates_running, ('Y', 'Z')).is_exhausted())
+
+    def test_preference_from(self):
+        vote = Vote(self.candidates_running, ('C', 'A', 'D'))
+
+        self.assertEqual('C', vote.preference_from(('A', 'C', 'D')))
+        self.assertEqual('A', vote.preference_from(('A', 'D')))
+        self.assertEqual('C', vote.preference_from(('B', 'C')))
+        self.assertEqual(None, vote.preference_from(('B',)))
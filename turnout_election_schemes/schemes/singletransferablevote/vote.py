@@ -1,17 +1,33 @@
+from .ballot_store import BallotStore
+
 class Vote(object):
     def __init__(self, candidates_running, candidate_preferences):
-        self.candidate_preferences = filter(
-            lambda candidate: candidate in candidates_running,
-            candidate_preferences
-        )
+        """
+        A single ballot, for code which deals with one ballot at a time. The
+        count itself keeps all of its ballots together in a BallotStore, and
+        a vote is the only ballot in a store of its own.
+        """
+        self._candidates_running = list(candidates_running)
+        self._ballots = BallotStore({
+            candidate: index
+                for index, candidate in enumerate(self._candidates_running)
+        })
+        self._ballot = self._ballots.add(candidate_preferences)
         self.value = 1
 
+    @property
+    def candidate_preferences(self):
+        return [
+            self._candidates_running[index]
+                for index in self._ballots.candidate_preferences(self._ballot)
+        ]
+
     def is_exhausted(self):
         """
         Returns true if this vote has no preferred candidates still running.
         """
 
-        return len(self.candidate_preferences) == 0
+        return self._ballots.is_exhausted(self._ballot)
 
     def preference_from(self, candidates):
         """
@@ -19,9 +35,7 @@ class Vote(object):
         or None if there isn't one.
         """
 
-        matches = filter(lambda candidate: candidate in candidates, self.candidate_preferences)
-
-        if len(matches) > 0:
-            return matches[0]
-        else:
-            return None
+        for candidate in self.candidate_preferences:
+            if candidate in candidates:
+                return candidate
+        return None